@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+import os
+import shutil
+import tempfile
+
+_dbc_cache_dir = tempfile.mkdtemp(prefix="dbcfeeder-test-cache-")
+
+
+def pytest_configure(config):
+    # Test modules parse CAN databases at import time already,
+    # make sure that they do not end up in the user's cache directory
+    os.environ["DBC_CACHE_DIR"] = _dbc_cache_dir
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_dbc_cache_dir, ignore_errors=True)
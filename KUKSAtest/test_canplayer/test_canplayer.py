@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+
+import os
+import threading
+
+import pytest  # type: ignore # noqa: F401
+
+from dbcfeederlib.canplayer import CANplayer
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+dump_file = test_path + "/../../candump.log"
+
+
+def test_replay_stops_if_no_message_passes_filter():
+    player = CANplayer(dump_file, "test_canplayer", frame_filter=lambda frame_id: False)
+    player._running = True
+    worker = threading.Thread(target=player._tx_worker)
+    worker.start()
+    worker.join(timeout=5)
+    try:
+        assert not worker.is_alive()
+        assert player._messages == []
+    finally:
+        player.stop()
+        worker.join()
+
+
+def test_only_filtered_messages_are_loaded():
+    player = CANplayer(dump_file, "test_canplayer", frame_filter=lambda frame_id: frame_id == 0x118)
+    try:
+        messages = player._load_messages()
+        assert len(messages) > 0
+        assert all(msg.arbitration_id == 0x118 for msg in messages)
+    finally:
+        player.stop()
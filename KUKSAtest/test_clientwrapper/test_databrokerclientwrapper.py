@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+
+import unittest.mock as mock
+
+import pytest  # type: ignore # noqa: F401
+
+from kuksa_client.grpc import DataType, VSSClientError
+
+from dbcfeederlib.databrokerclientwrapper import DatabrokerClientWrapper
+
+
+def _create_client() -> DatabrokerClientWrapper:
+    client = DatabrokerClientWrapper()
+    client._grpc_client = mock.Mock()
+    client._name_to_type = {"A.One": DataType.FLOAT, "A.Two": DataType.FLOAT}
+    return client
+
+
+def _sent_names(set_call) -> list:
+    return [update.entry.path for update in set_call.kwargs["updates"]]
+
+
+def test_update_datapoints_sends_single_request():
+    client = _create_client()
+
+    assert client.update_datapoints({"A.One": 1.0, "A.Two": 2.0})
+
+    client._grpc_client.set.assert_called_once()
+    assert _sent_names(client._grpc_client.set.call_args) == ["A.One", "A.Two"]
+
+
+def test_update_datapoints_falls_back_to_single_updates_on_error():
+    client = _create_client()
+    error = VSSClientError({"code": 400, "reason": "bad_request", "message": "invalid value"}, [])
+
+    def set_values(updates, **kwargs):
+        # reject the bulk request and the update of A.Two
+        if len(updates) > 1 or updates[0].entry.path == "A.Two":
+            raise error
+
+    client._grpc_client.set.side_effect = set_values
+
+    assert not client.update_datapoints({"A.One": 1.0, "A.Two": 2.0})
+
+    sent = [_sent_names(call) for call in client._grpc_client.set.call_args_list]
+    assert sent == [["A.One", "A.Two"], ["A.One"], ["A.Two"]]
+
+
+def test_update_datapoints_falls_back_to_single_updates_on_any_exception():
+    client = _create_client()
+
+    def set_values(updates, **kwargs):
+        # fail the bulk request and the update of A.One with an unexpected error
+        if len(updates) > 1 or updates[0].entry.path == "A.One":
+            raise ValueError("cannot convert value")
+
+    client._grpc_client.set.side_effect = set_values
+
+    assert not client.update_datapoints({"A.One": 1.0, "A.Two": 2.0})
+
+    sent = [_sent_names(call) for call in client._grpc_client.set.call_args_list]
+    assert sent == [["A.One", "A.Two"], ["A.One"], ["A.Two"]]
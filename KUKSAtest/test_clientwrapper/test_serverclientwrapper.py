@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+
+import unittest.mock as mock
+
+from dbcfeederlib.serverclientwrapper import ServerClientWrapper
+
+
+def _create_client(*connected: bool) -> ServerClientWrapper:
+    client = ServerClientWrapper()
+    client._kuksa = mock.Mock()
+    client._kuksa.checkConnection.side_effect = connected
+    return client
+
+
+def test_wait_connected_polls_until_connected():
+    client = _create_client(False, True)
+
+    assert client.wait_connected(1.0)
+
+    assert client._kuksa.checkConnection.call_count == 2
+    assert client._connected_event.is_set()
+
+
+def test_wait_connected_times_out():
+    client = _create_client(*[False] * 10)
+    client._connected_event.set()
+
+    assert not client.wait_connected(0.1)
+
+    assert not client._connected_event.is_set()
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+
+import os
+import shutil
+import unittest.mock as mock
+
+import pytest  # type: ignore
+
+from dbcfeederlib import dbcparser
+from dbcfeederlib.dbcparser import DBCParser
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("DBC_CACHE_DIR", str(cache_dir))
+    # start without any databases cached in memory
+    DBCParser._load_cached_database.cache_clear()
+    yield cache_dir
+    DBCParser._load_cached_database.cache_clear()
+
+
+@pytest.fixture
+def dbc_file(tmp_path):
+    dbc_file = tmp_path / "test.dbc"
+    shutil.copyfile(test_path + "/test1_1.dbc", dbc_file)
+    return str(dbc_file)
+
+
+def test_parsed_database_is_cached_on_disk(cache_dir, dbc_file):
+    parser = DBCParser([dbc_file])
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+    # WHEN the files are read again by another process
+    DBCParser._load_cached_database.cache_clear()
+    with mock.patch.object(DBCParser, "_parse_files") as parse_files:
+        cached_parser = DBCParser([dbc_file])
+
+    # THEN the database is read from the cache
+    parse_files.assert_not_called()
+    assert [msg.frame_id for msg in cached_parser._db.messages] == [msg.frame_id for msg in parser._db.messages]
+
+
+def test_cache_is_invalidated_when_file_changes(cache_dir, dbc_file):
+    DBCParser([dbc_file])
+    with open(dbc_file, "a", encoding="cp1252") as file:
+        file.write("\nCM_ \"changed\";\n")
+
+    with mock.patch.object(DBCParser, "_parse_files", wraps=DBCParser._parse_files) as parse_files:
+        DBCParser([dbc_file])
+
+    parse_files.assert_called_once()
+    assert len(list(cache_dir.glob("*.pkl"))) == 2
+
+
+def test_corrupt_cache_file_is_replaced(cache_dir, dbc_file):
+    DBCParser([dbc_file])
+    cache_file = next(cache_dir.glob("*.pkl"))
+    cache_file.write_bytes(b"not a pickle")
+    DBCParser._load_cached_database.cache_clear()
+
+    parser = DBCParser([dbc_file])
+
+    assert len(parser._db.messages) > 0
+    DBCParser._load_cached_database.cache_clear()
+    with mock.patch.object(DBCParser, "_parse_files") as parse_files:
+        DBCParser([dbc_file])
+    parse_files.assert_not_called()
+
+
+def test_failed_cache_write_leaves_no_files(cache_dir, dbc_file):
+    with mock.patch.object(dbcparser.pickle, "dump", side_effect=OSError("disk full")):
+        parser = DBCParser([dbc_file])
+
+    assert len(parser._db.messages) > 0
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_no_files_given(cache_dir):
+    with pytest.raises(ValueError):
+        DBCParser([])
@@ -38,10 +38,10 @@ def test_default_dbc():
     parser = dbcparser.DBCParser([def_dbc])
     msg_defs = parser.get_messages_for_signal('SteeringAngle129')
     assert len(msg_defs) == 1
-    assert msg_defs.pop().frame_id == 297
+    assert msg_defs[0].frame_id == 297
     msg_defs = parser.get_messages_for_signal('DI_uiSpeed')
     assert len(msg_defs) == 1
-    assert msg_defs.pop().frame_id == 599
+    assert msg_defs[0].frame_id == 599
 
     signals = [signal.name for signal in parser.get_signals_by_frame_id(599)]
     assert "DI_speedChecksum" in signals
@@ -60,11 +60,11 @@ def test_split_dbc():
     msg_defs = parser.get_messages_for_signal('SteeringAngle129')
     assert len(msg_defs) == 1
     # signal from message defined in first file
-    assert msg_defs.pop().frame_id == 297
+    assert msg_defs[0].frame_id == 297
     msg_defs = parser.get_messages_for_signal('DI_uiSpeed')
     assert len(msg_defs) == 1
     # signal from message defined in second file
-    assert msg_defs.pop().frame_id == 599
+    assert msg_defs[0].frame_id == 599
 
 
 def test_duplicated_dbc():
@@ -75,10 +75,10 @@ def test_duplicated_dbc():
     parser = dbcparser.DBCParser([def_dbc, def_dbc])
     msg_defs = parser.get_messages_for_signal('SteeringAngle129')
     assert len(msg_defs) == 1
-    assert msg_defs.pop().frame_id == 297
+    assert msg_defs[0].frame_id == 297
     msg_defs = parser.get_messages_for_signal('DI_uiSpeed')
     assert len(msg_defs) == 1
-    assert msg_defs.pop().frame_id == 599
+    assert msg_defs[0].frame_id == 599
 
 
 def test_single_kcd():
@@ -88,7 +88,7 @@ def test_single_kcd():
     parser = dbcparser.DBCParser([test_path + "/test1_1.kcd"])
     msg_defs = parser.get_messages_for_signal('DI_bmsRequestInterfaceVersion')
     assert len(msg_defs) == 1
-    assert msg_defs.pop().frame_id == 0x16
+    assert msg_defs[0].frame_id == 0x16
 
     signals = [signal.name for signal in parser.get_signals_by_frame_id(0x16)]
     assert "DI_bmsOpenContactorsRequest" in signals
@@ -103,11 +103,11 @@ def test_split_kcd():
     msg_defs = parser.get_messages_for_signal('DI_bmsRequestInterfaceVersion')
     assert len(msg_defs) == 1
     # signal from message defined in first file
-    assert msg_defs.pop().frame_id == 0x16
+    assert msg_defs[0].frame_id == 0x16
     msg_defs = parser.get_messages_for_signal('SteeringAngle129')
     assert len(msg_defs) == 1
     # signal from message defined in second file
-    assert msg_defs.pop().frame_id == 0x129
+    assert msg_defs[0].frame_id == 0x129
 
 
 def test_mixed_file_types():
@@ -119,11 +119,11 @@ def test_mixed_file_types():
     msg_defs = parser.get_messages_for_signal('DI_bmsRequestInterfaceVersion')
     assert len(msg_defs) == 1
     # signal from message defined in first file
-    assert msg_defs.pop().frame_id == 0x16
+    assert msg_defs[0].frame_id == 0x16
     msg_defs = parser.get_messages_for_signal('SteeringAngle129')
     assert len(msg_defs) == 1
     # signal from message defined in second file
-    assert msg_defs.pop().frame_id == 0x129
+    assert msg_defs[0].frame_id == 0x129
 
 
 def test_get_message_by_non_existing_frame_id_raises_keyerror():
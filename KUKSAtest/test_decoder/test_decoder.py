@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+import os
+import random
+
+import cantools
+import pytest  # type: ignore
+from cantools.database import Message, Signal
+
+from dbcfeederlib.dbc2vssmapper import Mapper
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+
+PAYLOADS = [
+    bytes(8),
+    bytes([0xff] * 8),
+    bytes([0x01, 0x23, 0x45, 0x67, 0x89, 0xab, 0xcd, 0xef]),
+    bytes([0x80, 0x00, 0x7f, 0xff, 0x00, 0x80, 0xfe, 0x01]),
+    bytes([0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x03]),
+]
+
+
+def _message(*signals):
+    return Message(frame_id=0x123, name="TestMessage", length=8, signals=list(signals))
+
+
+def _assert_same_as_cantools(message_def, payloads=PAYLOADS):
+    decoder = Mapper._build_decoder(message_def)
+    assert decoder is not None
+    for data in payloads:
+        expected = message_def.decode(data, decode_choices=True, scaling=True)
+        decoded = decoder(data)
+        assert decoded == expected
+        for name, value in expected.items():
+            assert type(decoded[name]) is type(value), name
+
+
+def test_little_endian_unsigned():
+    _assert_same_as_cantools(_message(
+        Signal(name="Aligned", start=8, length=16),
+        Signal(name="Unaligned", start=27, length=11),
+        Signal(name="Bit", start=63, length=1)))
+
+
+def test_big_endian():
+    _assert_same_as_cantools(_message(
+        Signal(name="Aligned", start=7, length=16, byte_order="big_endian"),
+        Signal(name="Unaligned", start=21, length=11, byte_order="big_endian"),
+        Signal(name="Signed", start=39, length=12, byte_order="big_endian", is_signed=True)))
+
+
+def test_signed():
+    _assert_same_as_cantools(_message(
+        Signal(name="Byte", start=0, length=8, is_signed=True),
+        Signal(name="Unaligned", start=13, length=7, is_signed=True),
+        Signal(name="Word", start=32, length=32, is_signed=True)))
+
+
+def test_float():
+    # all bits set is NaN, which never compares equal
+    payloads = [data for data in PAYLOADS if data != bytes([0xff] * 8)]
+    _assert_same_as_cantools(_message(
+        Signal(name="Single", start=0, length=32, is_float=True),
+        Signal(name="BigEndianSingle", start=39, length=32, byte_order="big_endian", is_float=True)), payloads)
+    _assert_same_as_cantools(_message(Signal(name="Double", start=0, length=64, is_float=True)), payloads)
+
+
+def test_scaled():
+    _assert_same_as_cantools(_message(
+        Signal(name="Scaled", start=0, length=16, scale=0.1, offset=-40),
+        Signal(name="IntScaled", start=16, length=8, scale=2, offset=1),
+        Signal(name="FloatIdentity", start=24, length=8, scale=1.0, offset=0.0),
+        Signal(name="SignedScaled", start=32, length=12, is_signed=True, scale=0.5)))
+
+
+def test_choices():
+    _assert_same_as_cantools(_message(
+        Signal(name="State", start=0, length=8, choices={0: "Off", 1: "On", 2: "Error"}),
+        Signal(name="ScaledState", start=8, length=8, scale=0.5, offset=1,
+               choices={0: "Init", 255: "Invalid"}),
+        Signal(name="SignedState", start=16, length=4, is_signed=True, choices={-1: "Unknown"}),
+        Signal(name="BigEndianState", start=31, length=4, byte_order="big_endian",
+               choices={15: "NotAvailable"})))
+
+
+def test_payload_length_mismatch():
+    decoder = Mapper._build_decoder(_message(Signal(name="Byte", start=0, length=8)))
+    assert decoder is not None
+    assert decoder(bytes(7)) is None
+
+
+@pytest.mark.parametrize("message_def", [
+    message_def for message_def in cantools.database.load_file(
+        os.path.join(test_path, "..", "..", "HRN.dbc"), strict=False).messages
+    if not message_def.is_multiplexed()
+], ids=lambda message_def: message_def.name)
+def test_same_as_cantools_for_dbc(message_def):
+    decoder = Mapper._build_decoder(message_def)
+    if decoder is None:
+        pytest.skip("message cannot be decoded by a generated function")
+    rand = random.Random(message_def.frame_id)
+    payloads = [bytes(rand.getrandbits(8) for _ in range(message_def.length)) for _ in range(20)]
+    for data in payloads:
+        assert decoder(data) == message_def.decode(data, decode_choices=True, scaling=True)
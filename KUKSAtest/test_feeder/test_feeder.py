@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+import threading
+import time
+import unittest.mock as mock
+
+import pytest  # type: ignore
+
+try:
+    from dbcfeeder import Feeder
+except OSError as e:
+    # the feeder loads the CAN interface's shared library on import
+    pytest.skip(f"Cannot load CAN library: {e}", allow_module_level=True)
+from dbcfeederlib.clientwrapper import ClientWrapper
+from dbcfeederlib.dbc2vssmapper import Mapper, VSSMapping, VSSObservation
+
+
+@pytest.fixture
+def feeder():
+    return Feeder(mock.create_autospec(spec=ClientWrapper), {})
+
+
+class TestCollectUpdates():
+
+    def test_keeps_newest_value_per_name(self, feeder) -> None:
+
+        # GIVEN several updates of the same VSS Data Entry
+        for update in [("Vehicle.Speed", 10), ("Vehicle.IsMoving", True), ("Vehicle.Speed", 12)]:
+            assert feeder._vss_update_queue.put_nowait(update)
+
+        # WHEN collecting the updates
+        updates = feeder._collect_updates(window=0.0)
+
+        # THEN only the newest value per VSS Data Entry is returned
+        assert updates == {"Vehicle.Speed": 12, "Vehicle.IsMoving": True}
+
+    def test_respects_max_items(self, feeder) -> None:
+
+        # GIVEN more updates than fit into a batch
+        for i in range(5):
+            assert feeder._vss_update_queue.put_nowait((f"Vehicle.Signal{i}", i))
+
+        # WHEN collecting a batch
+        updates = feeder._collect_updates(window=1.0, max_items=3)
+
+        # THEN the batch is returned as soon as it is full and the remaining updates stay queued
+        assert updates == {"Vehicle.Signal0": 0, "Vehicle.Signal1": 1, "Vehicle.Signal2": 2}
+        assert feeder._vss_update_queue.qsize() == 2
+
+    def test_respects_window(self, feeder) -> None:
+
+        # GIVEN an update that is queued and another one that arrives after the window has passed
+        assert feeder._vss_update_queue.put_nowait(("Vehicle.Speed", 10))
+        late_update = threading.Timer(0.5, feeder._vss_update_queue.put_nowait, args=[("Vehicle.Speed", 12)])
+        late_update.start()
+
+        # WHEN collecting the updates
+        start = time.monotonic()
+        updates = feeder._collect_updates(window=0.05)
+
+        # THEN the batch is returned once the window has passed, without the late update
+        assert time.monotonic() - start < 0.5
+        assert updates == {"Vehicle.Speed": 10}
+        late_update.join()
+        assert feeder._collect_updates(window=0.0) == {"Vehicle.Speed": 12}
+
+    def test_returns_empty_dict_on_timeout(self, feeder) -> None:
+
+        # GIVEN no updates
+
+        # WHEN collecting the updates
+        updates = feeder._collect_updates()
+
+        # THEN nothing is returned after waiting for the first update
+        assert updates == {}
+
+
+class TestReceiver():
+
+    def test_waits_for_writer(self, feeder) -> None:
+
+        # GIVEN a receiver with a queued observation
+        vss_mapping = mock.create_autospec(spec=VSSMapping, instance=True)
+        vss_mapping.transform_value.side_effect = lambda value: value
+        vss_mapping.change_condition_fulfilled.return_value = True
+        feeder._mapper = mock.create_autospec(spec=Mapper, instance=True)
+        feeder._mapper.get_dbc2vss_mappings_by_index.return_value = [vss_mapping]
+        observation = VSSObservation("SPEED", "Vehicle.Speed", 10, time.time(), 0)
+        assert feeder._dbc2vss_queue.put_nowait(observation)
+
+        feeder._running = True
+        receiver = threading.Thread(target=feeder._run_receiver)
+        receiver.start()
+        try:
+            # WHEN the writer is not ready
+            time.sleep(0.2)
+
+            # THEN the observation is not consumed
+            assert feeder._dbc2vss_queue.qsize() == 1
+            assert feeder._vss_update_queue.qsize() == 0
+
+            # WHEN the writer becomes ready
+            feeder._writer_ready.set()
+
+            # THEN the observation is handed over to the writer
+            assert feeder._vss_update_queue.wait(1.0)
+            assert feeder._vss_update_queue.get_batch(1) == [("Vehicle.Speed", 10)]
+        finally:
+            feeder._running = False
+            receiver.join()
@@ -69,6 +69,6 @@ def test_mapper_ignores_unused_duplicate_signal_definition():
     dbc_file_names = [test_path + "/../test_dbc/duplicate_signal_name.kcd"]
 
     mapper = dbc2vssmapper.Mapper(mapping_path, dbc_file_names, fail_on_duplicate_signal_definitions=True)
-    affected_signal_names = mapper.handle_update("A.B", 15)
+    affected_signal_names = [signal_name for _, signal_name, _ in mapper.handle_update("A.B", 15)]
     assert len(affected_signal_names) == 1
     assert "SignalTwo" in affected_signal_names
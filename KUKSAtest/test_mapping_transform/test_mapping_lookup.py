@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+# The intention of file is to test the lookup structures the mapper builds
+# for the mapped CAN signals and the pool of observations of their values
+
+from dbcfeederlib import dbc2vssmapper
+import os
+
+# read config only once
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+mapping_path = test_path + "/test.json"
+# defines the CAN signals S1 - S6 used in the mapping
+dbc_file_names = [test_path + "/test.dbc"]
+mapper: dbc2vssmapper.Mapper = dbc2vssmapper.Mapper(mapping_path, dbc_file_names)
+
+
+def test_mappings_by_index():
+    mappings = mapper.get_dbc2vss_mappings_by_index()
+    assert len(mappings) > 0
+    for mapping in mapper.get_dbc2vss_mappings("S1"):
+        assert mappings[mapping.mapping_idx] is mapping
+
+
+def test_lookup_tables_are_frozen():
+    assert isinstance(mapper.get_dbc2vss_mappings("S1"), tuple)
+    assert isinstance(mapper.get_dbc2vss_mappings_by_index(), tuple)
+
+
+def test_frame_id_whitelist():
+    whitelisted = [can_filter["can_id"] for can_filter in mapper.can_frame_id_whitelist()]
+    # the frames of test.dbc containing S1 - S6
+    assert sorted(whitelisted) == [0x101, 0x102]
+    for frame_id in whitelisted:
+        assert mapper.is_frame_id_whitelisted(frame_id)
+    unused_frame_id = next(frame_id for frame_id in range(0x800) if frame_id not in whitelisted)
+    assert not mapper.is_frame_id_whitelisted(unused_frame_id)
+
+
+def test_observations_are_recycled():
+    observation = dbc2vssmapper.VSSObservation.acquire("S1", "A.B", 1, 0.0, 0)
+    dbc2vssmapper.VSSObservation.release_all([observation])
+    recycled = dbc2vssmapper.VSSObservation.acquire("S2", "A.C", 2, 1.0, 1)
+    assert recycled is observation
+    assert recycled.dbc_name == "S2"
+    assert recycled.vss_name == "A.C"
+    assert recycled.raw_value == 2
+    assert recycled.mapping_idx == 1
@@ -20,21 +20,21 @@
 
 import unittest.mock as mock
 
-from queue import Queue
 from typing import Dict, List
 
-import pytest  # type: ignore # noqa: F401
+import pytest  # type: ignore
 
 from cantools.database import Message, Signal
 from dbcfeederlib.canreader import CanReader
 from dbcfeederlib.dbc2vssmapper import Mapper, VSSObservation, VSSMapping
 from dbcfeederlib.j1939reader import J1939Reader
+from dbcfeederlib.spscring import SPSCRing
 
 
 class TestCanReader():
 
     class NoopCanReader(CanReader):
-        def __init__(self, rxqueue: Queue, mapper: Mapper):
+        def __init__(self, rxqueue: SPSCRing, mapper: Mapper):
             super().__init__(rxqueue, mapper, "vcan0")
 
         def _start_can_bus_listener(self):
@@ -56,6 +56,7 @@ class TestCanReader():
             ])
         message_def.decode = mock.Mock(return_value=decoded_message)  # type: ignore
         mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = None
         mapper.get_message_by_frame_id.return_value = message_def
         mapper.get_dbc2vss_mappings.return_value = [VSSMapping(
             vss_name="Vehicle.Custom",
@@ -65,7 +66,7 @@ class TestCanReader():
             on_change=True,
             datatype="uint8",
             description="some custom signal")]
-        queue = mock.create_autospec(spec=Queue)
+        queue = mock.create_autospec(spec=SPSCRing)
         reader = TestCanReader.NoopCanReader(queue, mapper)
 
         # WHEN a message with a known frame ID is received
@@ -73,9 +74,77 @@ class TestCanReader():
 
         # THEN its signals are mapped to VSS data entries
         mapper.get_dbc2vss_mappings.assert_called_once_with("UnboundedSignal")
-        queue.put.assert_called_once()
-        assert queue.put.call_args.args[0].dbc_name == "UnboundedSignal"
-        assert queue.put.call_args.args[0].vss_name == "Vehicle.Custom"
+        queue.put_nowait.assert_called_once()
+        assert queue.put_nowait.call_args.args[0].dbc_name == "UnboundedSignal"
+        assert queue.put_nowait.call_args.args[0].vss_name == "Vehicle.Custom"
+
+    def test_process_can_message_uses_generated_decoder(self) -> None:
+
+        # GIVEN a reader based on a CAN message for which a decoder has been generated
+        message_def = Message(
+            frame_id=0x0104,
+            name="MyMessage",
+            length=8,
+            signals=[
+                Signal(name="AlignedSignal", start=8, length=16),
+            ])
+        message_def.decode = mock.Mock()  # type: ignore
+        mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = Mapper._build_decoder(message_def)
+        mapper.get_message_by_frame_id.return_value = message_def
+        mapper.get_dbc2vss_mappings.return_value = [VSSMapping(
+            vss_name="Vehicle.Custom",
+            dbc_name="AlignedSignal",
+            transform={},
+            interval_ms=0,
+            on_change=True,
+            datatype="uint16",
+            description="some custom signal")]
+        queue = mock.create_autospec(spec=SPSCRing)
+        reader = TestCanReader.NoopCanReader(queue, mapper)
+
+        # WHEN a message with the frame ID is received
+        reader._process_can_message(0x0104, bytes([0x00, 0x34, 0x12, 0, 0, 0, 0, 0]))
+
+        # THEN the signal value is read from the payload without decoding the whole message
+        message_def.decode.assert_not_called()
+        queue.put_nowait.assert_called_once()
+        assert queue.put_nowait.call_args.args[0].raw_value == 0x1234
+
+    def test_process_can_message_reports_dropped_values(self, caplog: pytest.LogCaptureFixture) -> None:
+
+        # GIVEN a reader whose queue is full
+        message_def = Message(
+            frame_id=0x0103,
+            name="MyMessage",
+            length=8,
+            signals=[
+                Signal(name="UnboundedSignal", start=0, length=8),
+            ])
+        mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = None
+        mapper.get_message_by_frame_id.return_value = message_def
+        mapper.get_dbc2vss_mappings.return_value = [VSSMapping(
+            vss_name="Vehicle.Custom",
+            dbc_name="UnboundedSignal",
+            transform={},
+            interval_ms=0,
+            on_change=True,
+            datatype="uint8",
+            description="some custom signal")]
+        queue = mock.create_autospec(spec=SPSCRing)
+        queue.put_nowait.return_value = False
+        reader = TestCanReader.NoopCanReader(queue, mapper)
+
+        # WHEN several messages are received
+        for _ in range(10):
+            reader._process_can_message(0x0103, bytes(8))
+
+        # THEN the dropped values are reported once rather than per value
+        assert queue.put_nowait.call_count == 10
+        warnings = [record for record in caplog.records if "Queue full" in record.getMessage()]
+        assert len(warnings) == 1
+        assert reader._dropped_observations == 9
 
     def test_process_can_message_ignores_out_of_range_values(self) -> None:
 
@@ -92,8 +161,9 @@ class TestCanReader():
             ])
         message_def.decode = mock.Mock(return_value=decoded_message)  # type: ignore
         mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = None
         mapper.get_message_by_frame_id.return_value = message_def
-        queue = mock.create_autospec(spec=Queue)
+        queue = mock.create_autospec(spec=SPSCRing)
         reader = TestCanReader.NoopCanReader(queue, mapper)
 
         # WHEN a  message is received from the CAN bus which only contains signals
@@ -103,12 +173,13 @@ class TestCanReader():
         # THEN the reader ignores the signal values
         mapper.get_message_by_frame_id.assert_called_once_with(0x0103)
         mapper.get_dbc2vss_mappings.assert_not_called()
-        queue.put.assert_not_called()
+        queue.put_nowait.assert_not_called()
 
     def test_process_can_message_ignores_unknown_messages(self) -> None:
         # GIVEN a reader based on an empty mapping definitions database
-        queue = mock.create_autospec(spec=Queue)
+        queue = mock.create_autospec(spec=SPSCRing)
         mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = None
         mapper.get_message_by_frame_id.return_value = None
         reader = TestCanReader.NoopCanReader(queue, mapper)
 
@@ -117,7 +188,7 @@ class TestCanReader():
 
         # THEN the reader ignores the message
         mapper.get_message_by_frame_id.assert_called_once_with(0x0102)
-        queue.put.assert_not_called()
+        queue.put_nowait.assert_not_called()
 
 
 def get_dbc2vss_mappings(signal_name: str) -> List[VSSMapping]:
@@ -170,9 +241,10 @@ class TestJ1939Reader():
     def test_j1939reader_processes_j1939_message(self) -> None:
 
         # GIVEN a reader based on CAN message and mapping definitions
-        queue = mock.create_autospec(spec=Queue)
+        queue = mock.create_autospec(spec=SPSCRing)
         message_def = get_message_definition(0x01FFFF10, True)
         mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = None
         mapper.get_message_by_frame_id.return_value = message_def
         mapper.get_dbc2vss_mappings.side_effect = get_dbc2vss_mappings
         j1939reader = J1939Reader(queue, mapper, "vcan0")
@@ -181,9 +253,9 @@ class TestJ1939Reader():
         j1939reader._on_message(priority=1, pgn=0x1FFFF, source_address=0x45, timestamp=0, data=[0x10, 0x32, 0x54])
 
         # THEN the reader determines both VSS Data Entries that the CAN signals are mapped to
-        assert queue.put.call_count == 2
+        assert queue.put_nowait.call_count == 2
         signal_mappings = {}
-        for obs in queue.put.call_args_list:
+        for obs in queue.put_nowait.call_args_list:
             signal_mappings[obs.args[0].dbc_name] = obs.args[0]
 
         assert_signal_mappings(signal_mappings)
@@ -194,9 +266,10 @@ class TestDBCReader():
     def test_dbcreader_processes_can_message(self) -> None:
 
         # GIVEN a reader based on CAN message and mapping definitions
-        queue = mock.create_autospec(spec=Queue)
+        queue = mock.create_autospec(spec=SPSCRing)
         message_def = get_message_definition(0x011A, False)
         mapper = mock.create_autospec(spec=Mapper)
+        mapper.get_decoder.return_value = None
         mapper.get_message_by_frame_id.return_value = message_def
         mapper.get_dbc2vss_mappings.side_effect = get_dbc2vss_mappings
         dbcreader = J1939Reader(queue, mapper, "vcan0")
@@ -205,9 +278,9 @@ class TestDBCReader():
         dbcreader._process_can_message(frame_id=0x111A, data=bytearray([0x10, 0x32, 0x54]))
 
         # THEN the reader determines both VSS Data Entries that the CAN signals are mapped to
-        assert queue.put.call_count == 2
+        assert queue.put_nowait.call_count == 2
         signal_mappings = {}
-        for obs in queue.put.call_args_list:
+        for obs in queue.put_nowait.call_args_list:
             signal_mappings[obs.args[0].dbc_name] = obs.args[0]
 
         assert_signal_mappings(signal_mappings)
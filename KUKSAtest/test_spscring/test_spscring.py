@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+
+########################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+########################################################################
+
+import threading
+
+import pytest  # type: ignore # noqa: F401
+
+from dbcfeederlib.spscring import SPSCRing
+
+
+def test_get_batch_returns_items_in_order():
+    ring = SPSCRing(capacity=4)
+    for i in range(3):
+        assert ring.put_nowait(i)
+    assert ring.qsize() == 3
+    assert ring.get_batch(2) == [0, 1]
+    assert ring.get_batch(2) == [2]
+    assert ring.get_batch(2) == []
+    assert ring.qsize() == 0
+
+
+def test_put_nowait_drops_items_if_full():
+    ring = SPSCRing(capacity=2)
+    assert ring.put_nowait("a")
+    assert ring.put_nowait("b")
+    assert not ring.put_nowait("c")
+    assert ring.get_batch(10) == ["a", "b"]
+    # indices wrap around
+    assert ring.put_nowait("d")
+    assert ring.get_batch(10) == ["d"]
+
+
+def test_wait_returns_when_item_is_added():
+    ring = SPSCRing()
+    assert not ring.wait(0.01)
+
+    producer = threading.Timer(0.05, ring.put_nowait, args=("x",))
+    producer.start()
+    assert ring.wait(5.0)
+    assert ring.get_batch(1) == ["x"]
+    producer.join()
@@ -29,19 +29,18 @@ import enum
 import errno
 import logging
 import os
-import queue
 import sys
 import threading
 import time
 
 from signal import SIGINT, SIGTERM, signal
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Mapping, Optional
 
-from cantools.database import Message
 from kuksa_client.grpc import EntryUpdate  # type: ignore
 
 from dbcfeederlib.canclient import CANClient
 from dbcfeederlib.canreader import CanReader
+from dbcfeederlib.spscring import SPSCRing
 from dbcfeederlib import dbc2vssmapper
 from dbcfeederlib import dbcreader
 from dbcfeederlib import j1939reader
@@ -52,6 +51,11 @@ from dbcfeederlib import elm2canbridge
 
 from kuksa_client.kuksa_logger import KuksaLogger  # type: ignore
 
+try:
+    import uvloop  # type: ignore[import]
+except ImportError:
+    uvloop = None
+
 log = logging.getLogger("dbcfeeder")
 
 CONFIG_SECTION_CAN = "can"
@@ -92,7 +96,11 @@ class Feeder:
         self._reader: Optional[CanReader] = None
         self._mapper: Optional[dbc2vssmapper.Mapper] = None
         self._registered: bool = False
-        self._dbc2vss_queue: queue.Queue[dbc2vssmapper.VSSObservation] = queue.Queue()
+        self._dbc2vss_queue = SPSCRing()
+        # VSS Data Entry updates (name, value) from the receiver to the writer thread
+        self._vss_update_queue = SPSCRing()
+        # Set by the writer thread while connected to KUKSA.val and all datapoints are registered
+        self._writer_ready = threading.Event()
         self._kuksa_client = kuksa_client
         self._elmcan_config = elmcan_config
         self._disconnect_time = 0.0
@@ -100,6 +108,9 @@ class Feeder:
         self._vss2dbc_enabled = vss2dbc
         self._canclient: Optional[CANClient] = None
         self._transmit: bool = False
+        # Created by the transmitter thread's event loop, set by stop() to end the subscription
+        self._transmitter_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
 
     def start(
         self,
@@ -150,6 +161,10 @@ class Feeder:
             receiver.start()
             threads.append(receiver)
 
+            writer = threading.Thread(target=self._run_writer)
+            writer.start()
+            threads.append(writer)
+
         if not self._vss2dbc_enabled:
             log.info("1 ---------------------------------- Mapping of VSS Data Entries to CAN signals is disabled.")
         elif not self._mapper.has_vss2dbc_mapping():
@@ -186,6 +201,10 @@ class Feeder:
         if self._canclient:
             self._canclient.stop()
         self._transmit = False
+        loop = self._transmitter_loop
+        if loop is not None and self._stop_event is not None and not loop.is_closed():
+            # stop() is called from the signal handler, i.e. not from the transmitter's event loop
+            loop.call_soon_threadsafe(self._stop_event.set)
 
     def is_running(self) -> bool:
         return self._running
@@ -202,27 +221,124 @@ class Feeder:
             return False
         all_registered = True
         for vss_name in self._mapper.get_vss_names():
-            log.debug("Checking if signal %s is registered", vss_name)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Checking if signal %s is registered", vss_name)
             resp = self._kuksa_client.is_signal_defined(vss_name)
             if not resp:
                 all_registered = False
         return all_registered
 
+    def _drain_queue(self, max_items: int = 256) -> List[dbc2vssmapper.VSSObservation]:
+        """
+        Get up to max_items observations from the queue.
+        Waits up to one second for observations to arrive if the queue is empty.
+        """
+        observations = self._dbc2vss_queue.get_batch(max_items)
+        if not observations and self._dbc2vss_queue.wait(1.0):
+            observations = self._dbc2vss_queue.get_batch(max_items)
+        return observations
+
     def _run_receiver(self):
+        """
+        Transform observed CAN signal values into VSS values and hand them over to the writer thread.
+        Does not do any network I/O, so decoding never stalls on KUKSA.val latency.
+        """
+        # Resolve mappings of queued observations by index rather than by name
+        mappings_by_index = self._mapper.get_dbc2vss_mappings_by_index()
         processing_started = False
-        messages_sent = 0
+        # Updates dropped because the update queue was full, reported at most every 5 seconds
+        dropped_updates = 0
+        last_drop_log_time = 0.0
+        while self._running is True:
+            # Mappings keep track of the last value sent, so only process observations
+            # while the writer is able to actually send them
+            if not self._writer_ready.wait(1.0):
+                continue
+            try:
+                if not processing_started:
+                    processing_started = True
+                    log.info("Starting to process CAN signals")
+                observations = self._drain_queue()
+                # checked once per batch rather than for every observation
+                debug_enabled = log.isEnabledFor(logging.DEBUG)
+                # CAN signals are often sent more frequently than they change,
+                # so only the newest value per VSS Data Entry is handed over for a batch
+                latest: Dict[str, Any] = {}
+                for vss_observation in observations:
+                    vss_mapping = mappings_by_index[vss_observation.mapping_idx]
+                    value = vss_mapping.transform_value(vss_observation.raw_value)
+                    if value is None:
+                        log.warning(
+                            "Value ignored for dbc %s to VSS %s, from raw value %s of type %s",
+                            vss_observation.dbc_name, vss_observation.vss_name, value, type(value)
+                        )
+                    elif not vss_mapping.change_condition_fulfilled(value):
+                        if debug_enabled:
+                            log.debug("Value condition not fulfilled for VSS %s, value %s",
+                                      vss_observation.vss_name, value)
+                    else:
+                        latest[vss_observation.vss_name] = value
+                dbc2vssmapper.VSSObservation.release_all(observations)
+
+                for vss_name, value in latest.items():
+                    if not self._vss_update_queue.put_nowait((vss_name, value)):
+                        dropped_updates += 1
+                if dropped_updates > 0:
+                    now = time.monotonic()
+                    if now - last_drop_log_time > 5.0:
+                        log.warning("Update queue full, dropped %d VSS values since last report", dropped_updates)
+                        dropped_updates = 0
+                        last_drop_log_time = now
+            except Exception:
+                log.error("Exception caugt in main loop", exc_info=True)
+
+    def _collect_updates(self, window: float = 0.01, max_items: int = 256) -> Dict[str, Any]:
+        """
+        Collect VSS updates from the receiver until the window has passed or max_items have been collected,
+        keeping only the newest value per VSS Data Entry.
+        Waits up to one second for the first update to arrive.
+        """
+        updates = self._vss_update_queue.get_batch(max_items)
+        if not updates:
+            if not self._vss_update_queue.wait(1.0):
+                return {}
+            updates = self._vss_update_queue.get_batch(max_items)
+        latest: Dict[str, Any] = dict(updates)
+        count = len(updates)
+        deadline = time.monotonic() + window
+        while count < max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            updates = self._vss_update_queue.get_batch(max_items - count)
+            if not updates:
+                if not self._vss_update_queue.wait(remaining):
+                    break
+                continue
+            count += len(updates)
+            latest.update(updates)
+        return latest
+
+    def _run_writer(self):
+        """
+        Send the VSS updates of the receiver to KUKSA.val, one request per batch.
+        """
+        datapoints_sent = 0
         last_sent_log_entry = 0
+        last_log_time = time.monotonic()
         queue_max_size = 0
         while self._running is True:
-            if self._kuksa_client.is_connected():
+            # Sleeps until the client reports to be connected instead of polling,
+            # the timeout only bounds how long it takes to notice that stop() has been called
+            wait_time = 1.0
+            if self._kuksa_client.wait_connected(wait_time):
                 self._disconnect_time = 0.0
             else:
                 # As we actually cannot register
                 self._registered = False
-                sleep_time = 0.2
-                time.sleep(sleep_time)
-                self._disconnect_time += sleep_time
-                if self._disconnect_time > 5:
+                self._writer_ready.clear()
+                self._disconnect_time += wait_time
+                if self._disconnect_time >= 5:
                     log.info("Server/Databroker still not connected!")
                     self._disconnect_time = 0.0
                 continue
@@ -232,44 +348,31 @@ class Feeder:
                     self.stop()
                     continue
                 self._registered = True
+                self._writer_ready.set()
             try:
-                if not processing_started:
-                    processing_started = True
-                    log.info("Starting to process CAN signals")
-                queue_size = self._dbc2vss_queue.qsize()
-                if queue_size > queue_max_size:
-                    queue_max_size = queue_size
-                vss_observation = self._dbc2vss_queue.get(timeout=1)
-                vss_mapping = self._mapper.get_dbc2vss_mapping(vss_observation.dbc_name, vss_observation.vss_name)
-                value = vss_mapping.transform_value(vss_observation.raw_value)
-                if value is None:
-                    log.warning(
-                        "Value ignored for dbc %s to VSS %s, from raw value %s of type %s",
-                        vss_observation.dbc_name, vss_observation.vss_name, value, type(value)
-                    )
-                elif not vss_mapping.change_condition_fulfilled(value):
-                    log.debug("Value condition not fulfilled for VSS %s, value %s", vss_observation.vss_name, value)
-                else:
-                    # update current value in KUKSA.val
-                    target = vss_observation.vss_name
-
-                    success = self._kuksa_client.update_datapoint(target, value)
-                    if success:
-                        log.debug("Succeeded sending DataPoint(%s, %s, %f)", target, value, vss_observation.time)
-                        print("Updated: Datapoint(%s, %s)", target, value)
-                        # Give status message after 1, 2, 4, 8, 16, 32, 64, .... messages have been sent
-                        messages_sent += 1
-                        if messages_sent >= (2 * last_sent_log_entry):
-                            log.info(
-                                "Update datapoint requests sent to kuksa.val so far: %d, "
-                                "maximum number of queued CAN messages so far: %d",
-                                messages_sent, queue_max_size
-                            )
-                            last_sent_log_entry = messages_sent
-            except queue.Empty:
-                pass
+                latest = self._collect_updates()
+                if not latest:
+                    continue
+                # update current values in KUKSA.val
+                success = self._kuksa_client.update_datapoints(latest)
+                if success:
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("Succeeded sending %d DataPoints: %s", len(latest), latest)
+                    datapoints_sent += len(latest)
+                    # Give status message at most every 5 seconds, independent of the CAN message rate
+                    now = time.monotonic()
+                    if now - last_log_time > 5.0 and datapoints_sent > last_sent_log_entry:
+                        # sampled only when logging, the queue size is not needed anywhere else
+                        queue_max_size = max(queue_max_size, self._dbc2vss_queue.qsize())
+                        log.info(
+                            "Datapoints sent to kuksa.val so far: %d, "
+                            "maximum number of queued CAN messages sampled so far: %d",
+                            datapoints_sent, queue_max_size
+                        )
+                        last_sent_log_entry = datapoints_sent
+                        last_log_time = now
             except Exception:
-                log.error("Exception caugt in main loop", exc_info=True)
+                log.error("Exception caught in writer loop", exc_info=True)
 
     async def _vss_update(self, updates: List[EntryUpdate]):
         if self._mapper is None:
@@ -279,8 +382,11 @@ class Feeder:
             # this should not happen because we always create a CAN client
             log.warning("Ignoring updated VSS Data Entries, no CAN bus client available")
         else:
-            log.debug("Processing %d VSS Data Entry updates", len(updates))
-            dbc_signal_names: Set[str] = set()
+            debug_enabled = log.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                log.debug("Processing %d VSS Data Entry updates", len(updates))
+            # Single pass over the updates, collecting the signal values of each affected CAN frame
+            frames: Dict[int, Dict[str, Any]] = {}
             for update in updates:
                 if update.entry.value is not None:
                     # This should never happen as we do not subscribe to current value
@@ -290,53 +396,58 @@ class Feeder:
                     )
 
                 if update.entry.actuator_target is not None:
-                    log.debug(
-                        "Target value for %s is now: %s of type %s",
-                        update.entry.path, update.entry.actuator_target, type(update.entry.actuator_target.value)
-                    )
+                    if debug_enabled:
+                        log.debug(
+                            "Target value for %s is now: %s of type %s",
+                            update.entry.path, update.entry.actuator_target, type(update.entry.actuator_target.value)
+                        )
                     affected_signals = self._mapper.handle_update(update.entry.path, update.entry.actuator_target.value)
-                    dbc_signal_names.update(affected_signals)
-                else:
+                    for frame_id, signal_name, value in affected_signals:
+                        sig_dict = frames.get(frame_id)
+                        if sig_dict is None:
+                            # start with the default and last known values of all of the frame's signals
+                            sig_dict = self._mapper.get_value_dict(frame_id)
+                            frames[frame_id] = sig_dict
+                        sig_dict[signal_name] = value
+                elif debug_enabled:
                     log.debug("######################## Actuator target is NONE #################")
 
-            messages_to_send: Set[Message] = set()
-            for signal_name in dbc_signal_names:
-                messages_to_send.update(self._mapper.get_messages_for_signal(signal_name))
-                log.info("Found %d messages for signal %s",
-                         len(messages_to_send), signal_name
-                         )
-
-            for message_definition in messages_to_send:
-                log.debug(
-                    "sending CAN message %s with frame ID %#x",
-                    message_definition.name, message_definition.frame_id
-                )
-                sig_dict = self._mapper.get_value_dict(message_definition.frame_id)
-                log.info(
-                    "Sending CAN message %s with frame ID %#x, signals: %s",
-                    message_definition.name, message_definition.frame_id, sig_dict
-                )
+            info_enabled = log.isEnabledFor(logging.INFO)
+            for frame_id, sig_dict in frames.items():
+                message_definition = self._mapper.get_message_by_frame_id(frame_id)
                 data = message_definition.encode(sig_dict)
-                log.info("Type CAN data prepare to send: %s", type(data))
-                log.info("Encoded CAN data: %s", data.hex())
-                self._canclient.send(arbitration_id=message_definition.frame_id, data=data)
+                if info_enabled:
+                    log.info(
+                        "Sending CAN message %s with frame ID %#x, signals: %s, encoded data: %s",
+                        message_definition.name, frame_id, sig_dict, data.hex()
+                    )
+                # Writing to the CAN device blocks, so leave it to the CAN client's writer thread
+                self._canclient.send_async(arbitration_id=frame_id, data=data)
 
     async def _run_subscribe(self):
         """
         Requests the client wrapper to start subscription.
-        Checks every second if we have requested to stop reception and if so exits
+        Waits until stop() has been called and then exits
         """
+        self._stop_event = asyncio.Event()
+        self._transmitter_loop = asyncio.get_running_loop()
+        if not self._transmit:
+            # stop() has been called before the event could be set
+            return
         log.info("VSS need to be SUB: %s", self._mapper.get_vss2dbc_entries())
         asyncio.create_task(self._kuksa_client.subscribe(self._mapper.get_vss2dbc_entries(), self._vss_update))
-        while self._transmit:
-            await asyncio.sleep(1)
+        await self._stop_event.wait()
 
     def _run_transmitter(self):
         """
         Starts subscription to selected VSS signals and on updates transmit to CAN
         """
         self._transmit = True
-        asyncio.run(self._run_subscribe())
+        if uvloop is not None:
+            # libuv based event loop with less overhead per callback and socket wakeup
+            uvloop.run(self._run_subscribe())
+        else:
+            asyncio.run(self._run_subscribe())
 
 
 def _parse_config(filename: str) -> configparser.ConfigParser:
@@ -487,19 +598,39 @@ def _get_command_line_args_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _resolve(args: argparse.Namespace, env: Mapping[str, str], config: configparser.ConfigParser,
+             arg_attr: str, env_name: str, section: str, option: str, cast: Callable[[str], Any] = str,
+             default: Any = None) -> Any:
+    """
+    Get a setting from the command line arguments, the environment or the configuration file,
+    in this order of precedence.
+    For cast=bool the setting is enabled by any non-empty environment variable value.
+    """
+    value = getattr(args, arg_attr)
+    if value:
+        return value
+    value = env.get(env_name)
+    if value:
+        return True if cast is bool else cast(value)
+    if cast is bool:
+        return config.getboolean(section, option, fallback=default)
+    return config.get(section, option, fallback=default)
+
+
 def main(argv):
     """Main entrypoint for dbcfeeder"""
     parser = _get_command_line_args_parser()
     args = parser.parse_args()
     config = _parse_config(args.config)
+    env = os.environ
 
     if args.dbc2val:
         use_dbc2val = True
     elif args.no_dbc2val:
         use_dbc2val = False
-    elif os.environ.get("USE_DBC2VAL"):
+    elif env.get("USE_DBC2VAL"):
         use_dbc2val = True
-    elif os.environ.get("NO_USE_DBC2VAL"):
+    elif env.get("NO_USE_DBC2VAL"):
         use_dbc2val = False
     else:
         # By default enabled
@@ -510,9 +641,9 @@ def main(argv):
         use_val2dbc = True
     elif args.no_val2dbc:
         use_val2dbc = False
-    elif os.environ.get("USE_VAL2DBC"):
+    elif env.get("USE_VAL2DBC"):
         use_val2dbc = True
-    elif os.environ.get("NO_USE_VAL2DBC"):
+    elif env.get("NO_USE_VAL2DBC"):
         use_val2dbc = False
     else:
         # By default disabled
@@ -522,55 +653,25 @@ def main(argv):
     if not (use_dbc2val or use_val2dbc):
         parser.error("Either DBC2VAL or VAL2DBC must be enabled")
 
-    if args.dbcfile:
-        dbcfile = args.dbcfile
-    elif os.environ.get("DBC_FILE"):
-        dbcfile = os.environ.get("DBC_FILE")
-    else:
-        dbcfile = config.get(CONFIG_SECTION_CAN, "dbcfile", fallback=None)
-
+    dbcfile = _resolve(args, env, config, "dbcfile", "DBC_FILE", CONFIG_SECTION_CAN, "dbcfile")
     if not dbcfile:
         parser.error("No DBC file(s) specified")
 
-    if args.canport:
-        canport = args.canport
-    elif os.environ.get("CAN_PORT"):
-        canport = os.environ.get("CAN_PORT")
-    else:
-        canport = config.get(CONFIG_SECTION_CAN, CONFIG_OPTION_PORT, fallback=None)
-
+    canport = _resolve(args, env, config, "canport", "CAN_PORT", CONFIG_SECTION_CAN, CONFIG_OPTION_PORT)
     if not canport:
         parser.error("No CAN port specified")
 
-    if args.dbc_default:
-        dbc_default = args.dbc_default
-    elif os.environ.get("DBC_DEFAULT_FILE"):
-        dbc_default = os.environ.get("DBC_DEFAULT_FILE")
-    else:
-        dbc_default = config.get(CONFIG_SECTION_CAN, CONFIG_OPTION_DBC_DEFAULT_FILE, fallback="dbc_default_values.json")
-
-    if args.mapping:
-        mappingfile = args.mapping
-    elif os.environ.get("MAPPING_FILE"):
-        mappingfile = os.environ.get("MAPPING_FILE")
-    else:
-        mappingfile = config.get(CONFIG_SECTION_GENERAL, CONFIG_OPTION_MAPPING, fallback="mapping/vss_4.0/vss_dbc.json")
-
-    if args.use_j1939:
-        use_j1939 = True
-    elif os.environ.get("USE_J1939"):
-        use_j1939 = True
-    else:
-        use_j1939 = config.getboolean(CONFIG_SECTION_CAN, CONFIG_OPTION_J1939, fallback=False)
+    dbc_default = _resolve(args, env, config, "dbc_default", "DBC_DEFAULT_FILE",
+                           CONFIG_SECTION_CAN, CONFIG_OPTION_DBC_DEFAULT_FILE, default="dbc_default_values.json")
+    mappingfile = _resolve(args, env, config, "mapping", "MAPPING_FILE",
+                           CONFIG_SECTION_GENERAL, CONFIG_OPTION_MAPPING, default="mapping/vss_4.0/vss_dbc.json")
+    use_j1939 = _resolve(args, env, config, "use_j1939", "USE_J1939",
+                         CONFIG_SECTION_CAN, CONFIG_OPTION_J1939, cast=bool, default=False)
 
     candumpfile = None
     if not args.use_socketcan:
-        if args.dumpfile:
-            candumpfile = args.dumpfile
-        elif os.environ.get("CANDUMP_FILE"):
-            candumpfile = os.environ.get("CANDUMP_FILE")
-        else:
-            candumpfile = config.get(CONFIG_SECTION_CAN, CONFIG_OPTION_CAN_DUMP_FILE, fallback=None)
+        candumpfile = _resolve(args, env, config, "dumpfile", "CANDUMP_FILE",
+                               CONFIG_SECTION_CAN, CONFIG_OPTION_CAN_DUMP_FILE)
 
         if args.val2dbc and candumpfile is not None:
             parser.error("Cannot use dumpfile and val2dbc at the same time!")
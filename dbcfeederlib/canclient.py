@@ -3,7 +3,9 @@ from ctypes import *
 import time
 import os
 import logging
-from typing import Optional
+import queue
+import threading
+from typing import Optional, Tuple
 import can  # type: ignore
 import sys
 import struct
@@ -16,7 +18,7 @@ sys.path.append(cur_path)
 from dbcfeederlib import canmessage
 
 log = logging.getLogger(__name__)
-log.info(f"Systems path of {__name__}: {cur_path}")
+log.info("Systems path of %s: %s", __name__, cur_path)
 
 # Lấy đường dẫn tuyệt đối tới file .so
 #so_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'libcontrolcanfd.so'))
@@ -284,7 +286,7 @@ def send_can_data(dev_ch1, can_id, can_data):
             raise ValueError("Unsupported can_data type")
             
     ret = canDLL.ZCAN_Transmit(dev_ch1, can_msgs, transmit_can_num)
-    log.info(f"\nCAN1 Transmit CAN Num: {ret} {transmit_can_num}")
+    log.info("CAN1 Transmit CAN Num: %s %s", ret, transmit_can_num)
 
 
 def receive_can_data(dev_ch2):
@@ -348,12 +350,26 @@ class CANClient:
         self._dev_ch1 = init_channel(self._device_handle, 0)  # CAN1 for testing
         configure_filter(self._dev_ch2)
         start_channel(self._dev_ch2)
+
+        # frames to be written by the writer thread, None tells the thread to stop
+        self._tx_queue: "queue.SimpleQueue[Optional[Tuple[int, bytes]]]" = queue.SimpleQueue()
+        self._tx_thread: Optional[threading.Thread] = None
+        # guards starting the writer thread against stop(), no frames are accepted once stopped
+        self._tx_lock = threading.Lock()
+        self._stopped = False
     
         
 
     def stop(self):
         """Shut down CAN bus."""
         # self._bus.shutdown()
+        with self._tx_lock:
+            self._stopped = True
+            tx_thread = self._tx_thread
+            self._tx_thread = None
+        if tx_thread is not None:
+            self._tx_queue.put(None)
+            tx_thread.join(timeout=5)
         close_device(dev_ch1=self._dev_ch1, dev_ch2=self._dev_ch2, device_handle=self._device_handle)
         log.info("Close USB CAN !!!")
 
@@ -419,3 +435,30 @@ class CANClient:
             #     log.debug("Sent message [channel: %s]: %s", self._bus.channel_info, msg)
         except can.CanError:
             log.error("Failed to send message via CAN bus")
+
+    def send_async(self, arbitration_id, data):
+        """
+        Queue message for being written to CAN bus.
+        Returns immediately, the (blocking) write is done by a dedicated writer thread
+        which sends the messages in the order they have been queued.
+        Messages are ignored once the client has been stopped.
+        """
+        with self._tx_lock:
+            if self._stopped:
+                log.debug("Ignoring message with frame ID %#x, CAN client has been stopped", arbitration_id)
+                return
+            if self._tx_thread is None:
+                self._tx_thread = threading.Thread(target=self._tx_worker, name="can-writer", daemon=True)
+                self._tx_thread.start()
+            self._tx_queue.put((arbitration_id, data))
+
+    def _tx_worker(self):
+        while True:
+            frame = self._tx_queue.get()
+            if frame is None:
+                break
+            try:
+                self.send(arbitration_id=frame[0], data=frame[1])
+            except Exception:
+                # keep the writer thread alive, otherwise all subsequent messages would be lost silently
+                log.error("Failed to send message with frame ID %#x", frame[0], exc_info=True)
@@ -14,6 +14,8 @@
 import logging
 import threading
 
+from typing import Callable, List, Optional
+
 import can  # type: ignore
 from can.interfaces.virtual import VirtualBus
 
@@ -34,23 +36,40 @@ class CANplayer:
 
     Gzip compressed files can be used as long as the original
     files suffix is one of the above (e.g. filename.asc.gz).
+
+    The file is parsed only once, messages are replayed from memory.
+    If a frame filter is given, only messages whose frame ID passes the filter are replayed.
     """
 
-    def __init__(self, dumpfile: str, can_port: str):
+    def __init__(self, dumpfile: str, can_port: str, frame_filter: Optional[Callable[[int], bool]] = None):
         self._running = False
         # open the file for reading can messages
         log.info("Starting repeated replay of CAN messages from log file %s", dumpfile)
         self._dumpfile = dumpfile
         self._can_port = can_port
+        self._frame_filter = frame_filter
+        self._messages: Optional[List[can.Message]] = None
         log.debug("Using virtual bus to replay CAN messages (channel: %s)", self._can_port)
         self._bus = VirtualBus(channel=can_port, bitrate=500000)
 
+    def _load_messages(self) -> List[can.Message]:
+        messages: List[can.Message] = []
+        for msg in can.LogReader(self._dumpfile):
+            if self._frame_filter is None or self._frame_filter(msg.arbitration_id):
+                messages.append(msg)
+        if messages:
+            log.info("Loaded %d CAN messages from log file %s", len(messages), self._dumpfile)
+        else:
+            log.warning(
+                "Log file %s does not contain any CAN messages with mapped frame IDs, nothing to replay",
+                self._dumpfile
+            )
+        return messages
+
     def _process_log(self):
         # using MessageSync in order to consider timestamps of CAN messages
         # and the delays between them
-
-        messages = can.LogReader(self._dumpfile)
-        log_reader = can.MessageSync(messages=messages, timestamps=True)
+        log_reader = can.MessageSync(messages=self._messages, timestamps=True)
         for msg in log_reader:
             if not self._running:
                 return
@@ -65,7 +84,10 @@ class CANplayer:
     def _tx_worker(self):
         log.info("Starting to write CAN messages to bus")
 
-        while self._running:
+        if self._messages is None:
+            self._messages = self._load_messages()
+        # without any messages to replay the loop would spin without ever waiting
+        while self._running and self._messages:
             self._process_log()
 
         log.info("Stopped writing CAN messages to bus")
@@ -23,8 +23,8 @@ import cantools.database  # type: ignore
 from cantools.typechecking import SignalMappingType
 from dbcfeederlib.canplayer import CANplayer
 from dbcfeederlib.dbc2vssmapper import Mapper, VSSObservation
+from dbcfeederlib.spscring import SPSCRing
 from typing import Any, Dict, Optional
-from queue import Queue
 
 log = logging.getLogger(__name__)
 
@@ -33,7 +33,7 @@ class CanReader(ABC):
     """
     Provides means to read messages from a CAN bus.
     """
-    def __init__(self, rxqueue: Queue, mapper: Mapper, can_port: str,
+    def __init__(self, rxqueue: SPSCRing, mapper: Mapper, can_port: str,
                  dump_file: Optional[str] = None, can_fd: bool = False):
         """
         This init method is only supposed to be called by subclass' __init__ functions.
@@ -43,6 +43,9 @@ class CanReader(ABC):
         self._mapper = mapper
         self._running = False
         self._can_player: Optional[CANplayer] = None
+        # Observations dropped because the queue was full, reported at most every 5 seconds
+        self._dropped_observations = 0
+        self._last_drop_log_time = 0.0
 
         can_filters = mapper.can_frame_id_whitelist()
         log.info("Using CAN frame ID whitelist=%s", can_filters)
@@ -55,7 +58,7 @@ class CanReader(ABC):
         if dump_file is not None:
             self._can_kwargs["interface"] = "virtual"
             self._can_kwargs["bitrate"] = 500000
-            self._can_player = CANplayer(dump_file, can_port)
+            self._can_player = CANplayer(dump_file, can_port, mapper.is_frame_id_whitelisted)
 
     def is_running(self) -> bool:
         return self._running
@@ -95,7 +98,16 @@ class CanReader(ABC):
         self._stop_can_bus_listener()
 
     def _process_can_message(self, frame_id: int, data: Any):
+        if not self._mapper.is_frame_id_whitelisted(frame_id):
+            # the CAN client does not necessarily filter frames, so drop them before decoding
+            return
         try:
+            decoder = self._mapper.get_decoder(frame_id)
+            if decoder is not None:
+                decoded = decoder(data)
+                if decoded is not None:
+                    self._handle_decoded_frame(self._mapper.get_message_by_frame_id(frame_id), decoded, time.time())
+                    return
             message_def = self._mapper.get_message_by_frame_id(frame_id)
             log.info("Processing CAN message with frame ID: %#x", frame_id)
             if message_def is not None:
@@ -117,6 +129,19 @@ class CanReader(ABC):
         except Exception:
             log.warning("Error processing CAN message with frame ID: %#x", frame_id, exc_info=True)
 
+    def _report_dropped_observation(self):
+        """
+        Count an observation dropped because the queue is full.
+        The queue fills up quickly while the receiver is not processing observations,
+        so the drops are logged at most every 5 seconds rather than once per observation.
+        """
+        self._dropped_observations += 1
+        now = time.monotonic()
+        if now - self._last_drop_log_time > 5.0:
+            log.warning("Queue full, dropped %d CAN signal values since last report", self._dropped_observations)
+            self._dropped_observations = 0
+            self._last_drop_log_time = now
+
     def _handle_decoded_frame(self, message_def: cantools.database.Message, decoded: SignalMappingType, rx_time: float):
         
         log.info("Handling decoded frame for message: %s", message_def.name)
@@ -152,10 +177,14 @@ class CanReader(ABC):
                         "Queueing %s, triggered by %s, raw value %s",
                         signal_mapping.vss_name, signal_name, raw_value
                     )
-                    self._queue.put(VSSObservation(
-                        signal_name, signal_mapping.vss_name, raw_value, rx_time))
-                    log.info("Put VSS observation: %s", VSSObservation(
-                        signal_name, signal_mapping.vss_name, raw_value, rx_time))
+                    observation = VSSObservation.acquire(
+                        signal_name, signal_mapping.vss_name, raw_value, rx_time, signal_mapping.mapping_idx)
+                    if not self._queue.put_nowait(observation):
+                        VSSObservation.release_all((observation,))
+                        self._report_dropped_observation()
+                        continue
+                    # only this thread modifies pooled observations, so it is safe to use it after queueing
+                    log.info("Put VSS observation: %s", observation)
                 else:
                     log.debug(
                         "Ignoring %s, triggered by %s, raw value %s",
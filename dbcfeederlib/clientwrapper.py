@@ -14,7 +14,8 @@
 #################################################################################
 
 import logging
-from typing import Any, List, Optional
+import threading
+from typing import Any, Dict, List, Optional
 
 from abc import ABC, abstractmethod
 
@@ -38,6 +39,8 @@ class ClientWrapper(ABC):
         self._registered = False
         self._root_ca_path: Optional[str] = None
         self._tls_server_name: Optional[str] = None
+        # Set while connected to the server, to be maintained by subclasses
+        self._connected_event = threading.Event()
         self._do_init()
 
     def _do_init(self):
@@ -92,6 +95,13 @@ class ClientWrapper(ABC):
     def is_connected(self) -> bool:
         pass
 
+    def wait_connected(self, timeout: float) -> bool:
+        """
+        Block until connected to the server or the timeout expires.
+        Returns True if connected.
+        """
+        return self._connected_event.wait(timeout)
+
     @abstractmethod
     def is_signal_defined(self, vss_name: str) -> bool:
         pass
@@ -100,6 +110,24 @@ class ClientWrapper(ABC):
     def update_datapoint(self, name: str, value: Any) -> bool:
         pass
 
+    def update_datapoints(self, datapoints: Dict[str, Any]) -> bool:
+        """
+        Update multiple datapoints, keys are VSS names.
+        This default implementation updates the datapoints one by one,
+        clients supporting bulk updates should override it.
+        Returns True if all datapoints have been updated successfully.
+        """
+        success = True
+        for name, value in datapoints.items():
+            try:
+                if not self.update_datapoint(name, value):
+                    success = False
+            except Exception:
+                # only lose the value that cannot be sent, not the remaining ones
+                log.error("Error sending %s to %s", value, name, exc_info=True)
+                success = False
+        return success
+
     @abstractmethod
     def stop(self):
         pass
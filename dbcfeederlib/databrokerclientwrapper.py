@@ -73,15 +73,15 @@ class DatabrokerClientWrapper(clientwrapper.ClientWrapper):
         Start connection to databroker and authorize
         """
 
-        log.info(f"Connecting to Data Broker using {self._ip}:{self._port}")
+        log.info("Connecting to Data Broker using %s:%s", self._ip, self._port)
 
         # For now will just throw a FileNotFoundError if file cannot be found
         # token = ""
         if self._token_path != "":
-            log.info(f"Token path specified is {self._token_path}")
+            log.info("Token path specified is %s", self._token_path)
             with open(self._token_path, "r") as file:
                 self._token = file.read()
-            log.debug(f"Token is: {self._token}")
+            log.debug("Token is: %s", self._token)
         else:
             log.info("No token path specified. KUKSA.val Databroker must run without authentication!")
 
@@ -119,6 +119,7 @@ class DatabrokerClientWrapper(clientwrapper.ClientWrapper):
             if not self._connected:
                 log.info("Connected to data broker")
                 self._connected = True
+                self._connected_event.set()
         else:
             if self._connected:
                 log.info("Disconnected from data broker")
@@ -126,6 +127,7 @@ class DatabrokerClientWrapper(clientwrapper.ClientWrapper):
                 if connectivity == grpc.ChannelConnectivity.CONNECTING:
                     log.info("Trying to connect to data broker")
             self._connected = False
+            self._connected_event.clear()
 
     def is_connected(self) -> bool:
         log.info("Check if connected to data broker")
@@ -187,11 +189,37 @@ class DatabrokerClientWrapper(clientwrapper.ClientWrapper):
             log.debug("%s => %s", name, value)
 
         except kuksa_client.grpc.VSSClientError:
-            log.error(f"Error sending {value} to databroker", exc_info=True)
+            log.error("Error sending %s to databroker", value, exc_info=True)
             return False
 
         return True
 
+    def update_datapoints(self, datapoints: Dict[str, Any]) -> bool:
+        """
+        Update multiple datapoints using a single Set request.
+        """
+        if self._grpc_client is None:
+            log.warning("update_datapoints called before client has been started")
+            return False
+        try:
+            updates = tuple(EntryUpdate(DataEntry(
+                name,
+                value=Datapoint(value=value),
+                metadata=Metadata(data_type=self._name_to_type[name]),
+            ), (Field.VALUE,)) for name, value in datapoints.items())
+
+            self._grpc_client.set(updates=updates, **self._rpc_kwargs)
+            log.debug("Sent %d datapoints: %s", len(updates), datapoints)
+
+        except Exception:
+            # The request fails as a whole if a single entry is rejected or cannot be converted,
+            # so retry the entries one by one to not lose the valid ones
+            log.warning("Error sending %d datapoints to databroker, sending them one by one",
+                        len(datapoints), exc_info=True)
+            return super().update_datapoints(datapoints)
+
+        return True
+
     def stop(self):
         log.info("Stopping databroker client")
         if self._grpc_client is None:
@@ -222,5 +250,5 @@ class DatabrokerClientWrapper(clientwrapper.ClientWrapper):
         async with VSSClient(self._ip, self._port, token=self._token,
                              root_certificates=root_path, tls_server_name=self._tls_server_name) as client:
             async for updates in client.subscribe(entries=entries):
-                log.debug(f"Received update of length {len(updates)}")
+                log.debug("Received update of length %d", len(updates))
                 await callback(updates)
\ No newline at end of file
@@ -26,11 +26,12 @@ VSS signal values as defined in a mapping.
 
 import json
 import logging
+import struct
 import sys
 import cantools
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Set, Optional, KeysView
+from collections import deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Set, Optional, KeysView, Sequence, Tuple
 
 from can.typechecking import CanFilter
 from py_expression_eval import Parser  # type: ignore[import]
@@ -39,19 +40,59 @@ from dbcfeederlib.dbcparser import DBCParser
 
 log = logging.getLogger(__name__)
 
+# Decodes a CAN frame's payload into signal values, returns None if the payload does not match
+FrameDecoder = Callable[[Any], Optional[Dict[str, Any]]]
+
+# Used by the generated frame decoders to reinterpret raw bits of float signals
+_FLOAT_UNPACKERS = {32: struct.Struct(">f"), 64: struct.Struct(">d")}
+
 
-@dataclass
 class VSSObservation:
     """
     A VSSObservation is a container for a single observation/data for a single VSS signal.
     The data contained is the raw data as received on CAN, it has not yet been transformed
     into VSS representation.
+
+    Observations are created at the CAN frame rate, so instances are recycled: the CAN reader
+    gets them via acquire() and the consumer hands them back via release_all() once processed.
     """
 
-    dbc_name: str
-    vss_name: str
-    raw_value: Any
-    time: float
+    __slots__ = ("dbc_name", "vss_name", "raw_value", "time", "mapping_idx")
+
+    # Free list of processed instances, deque's append/pop are thread safe
+    _pool: Deque["VSSObservation"] = deque(maxlen=4096)
+
+    def __init__(self, dbc_name: str, vss_name: str, raw_value: Any, time: float, mapping_idx: int):
+        self.dbc_name = dbc_name
+        self.vss_name = vss_name
+        self.raw_value = raw_value
+        self.time = time
+        # index of the VSSMapping in Mapper.get_dbc2vss_mappings_by_index()
+        self.mapping_idx = mapping_idx
+
+    def __repr__(self) -> str:
+        return (f"VSSObservation(dbc_name={self.dbc_name!r}, vss_name={self.vss_name!r}, "
+                f"raw_value={self.raw_value!r}, time={self.time!r}, mapping_idx={self.mapping_idx!r})")
+
+    @classmethod
+    def acquire(cls, dbc_name: str, vss_name: str, raw_value: Any, time: float,
+                mapping_idx: int) -> "VSSObservation":
+        """Get an observation from the pool, or a new one if the pool is empty."""
+        try:
+            observation = cls._pool.pop()
+        except IndexError:
+            return cls(dbc_name, vss_name, raw_value, time, mapping_idx)
+        observation.dbc_name = dbc_name
+        observation.vss_name = vss_name
+        observation.raw_value = raw_value
+        observation.time = time
+        observation.mapping_idx = mapping_idx
+        return observation
+
+    @classmethod
+    def release_all(cls, observations: Iterable["VSSObservation"]):
+        """Return processed observations to the pool, they must not be used afterwards."""
+        cls._pool.extend(observations)
 
 
 class VSSMapping:
@@ -83,6 +124,8 @@ class VSSMapping:
         # For value comparison (on_changes) we store last value used for comparison
         self.last_vss_value: Any = None
         self.last_dbc_value: Any = None
+        # Index of this mapping in the mapper's list of dbc2vss mappings, assigned by the mapper
+        self.mapping_idx: int = -1
 
     def time_condition_fulfilled(self, time: float) -> bool:
         """
@@ -198,6 +241,23 @@ class VSSMapping:
         return vss_value
 
 
+class _MappingTables:
+    """
+    The mappings collected while reading the mapping definitions,
+    frozen into the Mapper's read-only lookup tables once complete.
+    """
+
+    def __init__(self) -> None:
+        # Key is the CAN signal name
+        self.dbc2vss: Dict[str, List[VSSMapping]] = {}
+        # Key is the VSS data entry name
+        self.vss2dbc: Dict[str, List[VSSMapping]] = {}
+        # Key is the frame ID of the CAN messages containing the vss2dbc mapped signals
+        self.vss2dbc_by_can_id: Dict[int, List[VSSMapping]] = {}
+        # All dbc2vss mappings, VSSMapping.mapping_idx is the index in this list
+        self.mappings_by_index: List[VSSMapping] = []
+
+
 class Mapper(DBCParser):
     """
     Contains all mappings between CAN and VSS signals.
@@ -243,18 +303,52 @@ class Mapper(DBCParser):
                     )
                     sys.exit(-1)
 
-        # Where we keep mapping, key is dbc signal name
-        self._dbc2vss_mapping: Dict[str, List[VSSMapping]] = {}
-        # In this direction key is the VSS data entry name
-        self._vss2dbc_mapping: Dict[str, List[VSSMapping]] = {}
-        # Same, but key is CAN id mapping
-        self._vss2dbc_can_id_mapping: Dict[int, List[VSSMapping]] = {}
         # All frame IDs of CAN messages that contain signals for which a mapping to VSS exists
         self._mapped_can_frame_ids: Set[int] = set()
         self._can_filters: List[CanFilter] = []
 
         self._fail_on_duplicate_signal_definitions = fail_on_duplicate_signal_definitions
-        self._traverse_vss_node("", jsonmapping)
+        tables = _MappingTables()
+        self._traverse_vss_node(tables, "", jsonmapping)
+
+        # The lookup tables are read-only once all mappings have been read.
+        # Where we keep mapping, key is dbc signal name
+        self._dbc2vss_mapping: Dict[str, Tuple[VSSMapping, ...]] = {
+            name: tuple(mappings) for name, mappings in tables.dbc2vss.items()}
+        # In this direction key is the VSS data entry name
+        self._vss2dbc_mapping: Dict[str, Tuple[VSSMapping, ...]] = {
+            name: tuple(mappings) for name, mappings in tables.vss2dbc.items()}
+        # Same, but key is CAN id mapping
+        self._vss2dbc_can_id_mapping: Dict[int, Tuple[VSSMapping, ...]] = {
+            frame_id: tuple(mappings) for frame_id, mappings in tables.vss2dbc_by_can_id.items()}
+        # All dbc2vss mappings, VSSMapping.mapping_idx is the index in this tuple
+        self._mappings_by_index: Tuple[VSSMapping, ...] = tuple(tables.mappings_by_index)
+        # Default values of the signals of CAN frames written by vss2dbc mappings, key is frame ID.
+        # get_value_dict() hands out copies.
+        self._default_values: Dict[int, Dict[str, Any]] = {
+            frame_id: self.get_default_values(frame_id) for frame_id in self._vss2dbc_can_id_mapping}
+
+        # Lookup tables for checking received frame IDs against the whitelist.
+        # A byte per possible ID for standard (11-bit) frame IDs, a set for (masked) extended frame IDs.
+        self._frame_id_accept_table: Optional[bytearray] = None
+        self._accepted_extended_frame_ids: FrozenSet[int] = frozenset()
+        if expect_extended_frame_ids:
+            self._accepted_extended_frame_ids = frozenset(
+                frame_id & self._frame_id_mask for frame_id in self._mapped_can_frame_ids)
+        else:
+            self._frame_id_accept_table = bytearray(self._frame_id_mask + 1)
+            for frame_id in self._mapped_can_frame_ids:
+                self._frame_id_accept_table[frame_id & self._frame_id_mask] = 1
+
+        # Key is the (masked) frame ID
+        self._decoders: Dict[int, FrameDecoder] = {}
+        for msg_def in self._db.messages:
+            if msg_def.frame_id in self._mapped_can_frame_ids:
+                decoder = self._build_decoder(msg_def, self._dbc2vss_mapping.keys())
+                if decoder is not None:
+                    self._decoders[msg_def.frame_id & self._frame_id_mask] = decoder
+        log.info("Using generated decoders for %d of %d mapped CAN frames",
+                 len(self._decoders), len(self._mapped_can_frame_ids))
 
     def can_frame_id_whitelist(self) -> List[CanFilter]:
         """
@@ -267,6 +361,105 @@ class Mapper(DBCParser):
 
         return self._can_filters
 
+    def is_frame_id_whitelisted(self, frame_id: int) -> bool:
+        """
+        Check if a received CAN frame contains signals for which a mapping to VSS exists.
+        """
+        if self._frame_id_accept_table is not None:
+            return self._frame_id_accept_table[frame_id & self._frame_id_mask] != 0
+        return (frame_id & self._frame_id_mask) in self._accepted_extended_frame_ids
+
+    @staticmethod
+    def _build_decoder(msg_def: cantools.database.Message,
+                       signal_names: Optional[Iterable[str]] = None) -> Optional[FrameDecoder]:
+        """
+        Generate a function that decodes the given signals (all if None) of a CAN frame.
+
+        The bit shifts, masks and scaling of each signal are inlined into the function's source,
+        so that decoding a frame does not need to walk cantools' generic signal definitions.
+        The function returns None if the payload's length does not match the message definition.
+        Returns None if the message cannot be decoded by a generated function.
+        """
+        if msg_def.is_container or msg_def.is_multiplexed():
+            return None
+        wanted = None if signal_names is None else set(signal_names)
+        length = msg_def.length
+        namespace: Dict[str, Any] = {}
+        # statements binding raw values that are needed more than once
+        statements: List[str] = []
+        entries: List[str] = []
+        uses_little_endian = False
+        uses_big_endian = False
+        for signal in msg_def.signals:
+            if wanted is not None and signal.name not in wanted:
+                continue
+            if signal.is_float and signal.length not in _FLOAT_UNPACKERS:
+                return None
+            if signal.byte_order == "little_endian":
+                uses_little_endian = True
+                payload = "v"
+                lsb = signal.start
+                if lsb + signal.length > length * 8:
+                    return None
+            else:
+                uses_big_endian = True
+                payload = "w"
+                # the start bit of big endian signals denotes their most significant bit
+                lsb = (length - 1 - signal.start // 8) * 8 + signal.start % 8 - (signal.length - 1)
+                if lsb < 0:
+                    return None
+            mask = (1 << signal.length) - 1
+            expr = f"(({payload} >> {lsb}) & {mask:#x})"
+            if signal.is_float:
+                namespace[f"_f{signal.length}"] = _FLOAT_UNPACKERS[signal.length]
+                expr = f"_f{signal.length}.unpack({expr}.to_bytes({signal.length // 8}, 'big'))[0]"
+            elif signal.is_signed:
+                sign = 1 << (signal.length - 1)
+                expr = f"(({expr} ^ {sign:#x}) - {sign:#x})"
+            # same as cantools: the scaled value is used if the raw value has no choice,
+            # scaling is skipped only if it cannot change the value or its type
+            scaled = "{raw}"
+            if not (type(signal.scale) is int and signal.scale == 1
+                    and type(signal.offset) is int and signal.offset == 0):
+                scaled = f"{signal.scale!r} * {{raw}} + {signal.offset!r}"
+            if signal.choices:
+                raw = f"r{len(entries)}"
+                choices = f"_choices{len(entries)}"
+                namespace[choices] = signal.choices
+                statements.append(f"    {raw} = {expr}")
+                expr = f"{choices}[{raw}] if {raw} in {choices} else " + scaled.format(raw=raw)
+            else:
+                expr = scaled.format(raw=expr)
+            entries.append(f"        {signal.name!r}: {expr},")
+
+        if not entries:
+            return None
+        lines = [
+            "def _decode(data):",
+            f"    if len(data) != {length}:",
+            "        return None",
+        ]
+        if uses_little_endian:
+            lines.append("    v = int.from_bytes(data, 'little')")
+        if uses_big_endian:
+            lines.append("    w = int.from_bytes(data, 'big')")
+        lines.extend(statements)
+        lines.append("    return {")
+        lines.extend(entries)
+        lines.append("    }")
+        source = "\n".join(lines)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Generated decoder for CAN message %s:\n%s", msg_def.name, source)
+        exec(compile(source, f"<decoder {msg_def.name}>", "exec"), namespace)  # pylint: disable=exec-used
+        return namespace["_decode"]
+
+    def get_decoder(self, frame_id: int) -> Optional[FrameDecoder]:
+        """
+        Get the generated decoder for the mapped signals of a CAN frame.
+        Returns None if the frame needs to be decoded by cantools.
+        """
+        return self._decoders.get(frame_id & self._frame_id_mask)
+
     def transform_dbc_value(self, vss_observation: VSSObservation) -> Any:
         """
         Find VSS mapping and transform DBC value to VSS value.
@@ -327,7 +520,7 @@ class Mapper(DBCParser):
             sys.exit(-1)
         return transform
 
-    def _analyze_dbc2vss(self, expanded_name, node: dict, dbc2vss: dict):
+    def _analyze_dbc2vss(self, tables: _MappingTables, expanded_name, node: dict, dbc2vss: dict):
         """
         Analyze a dbc2vss entry (from CAN to VSS).
         """
@@ -364,17 +557,19 @@ class Mapper(DBCParser):
                 log.info("Using default interval 1000 ms for mapping definition of %s", expanded_name)
                 interval = 1000
 
-        if can_signal_name not in self._dbc2vss_mapping:
-            self._dbc2vss_mapping[can_signal_name] = []
+        if can_signal_name not in tables.dbc2vss:
+            tables.dbc2vss[can_signal_name] = []
         mapping_entry = VSSMapping(expanded_name, can_signal_name, transformation_definition, interval, on_change,
                                    node["datatype"], node["description"])
-        self._dbc2vss_mapping[can_signal_name].append(mapping_entry)
+        tables.dbc2vss[can_signal_name].append(mapping_entry)
+        mapping_entry.mapping_idx = len(tables.mappings_by_index)
+        tables.mappings_by_index.append(mapping_entry)
 
         for msg_def in self.get_messages_for_signal(can_signal_name):
             # Make sure that CAN frames with this ID pass CAN filtering
             self._mapped_can_frame_ids.add(msg_def.frame_id)
 
-    def _analyze_vss2dbc(self, expanded_name, node: dict, vss2dbc: dict):
+    def _analyze_vss2dbc(self, tables: _MappingTables, expanded_name, node: dict, vss2dbc: dict):
         """
         Analyze a vss2dbc entry (from VSS to CAN).
         """
@@ -419,17 +614,17 @@ class Mapper(DBCParser):
 
         mapping_entry = VSSMapping(expanded_name, can_signal_name, transform, interval, on_change,
                                    node["datatype"], node["description"])
-        if can_signal_name not in self._vss2dbc_mapping:
-            self._vss2dbc_mapping[expanded_name] = []
-        self._vss2dbc_mapping[expanded_name].append(mapping_entry)
+        if can_signal_name not in tables.vss2dbc:
+            tables.vss2dbc[expanded_name] = []
+        tables.vss2dbc[expanded_name].append(mapping_entry)
 
         # Also add CAN-id
         for msg_def in self.get_messages_for_signal(can_signal_name):
-            if msg_def.frame_id not in self._vss2dbc_can_id_mapping:
-                self._vss2dbc_can_id_mapping[msg_def.frame_id] = []
-            self._vss2dbc_can_id_mapping[msg_def.frame_id].append(mapping_entry)
+            if msg_def.frame_id not in tables.vss2dbc_by_can_id:
+                tables.vss2dbc_by_can_id[msg_def.frame_id] = []
+            tables.vss2dbc_by_can_id[msg_def.frame_id].append(mapping_entry)
 
-    def _analyze_signal(self, expanded_name, node):
+    def _analyze_signal(self, tables: _MappingTables, expanded_name, node):
         """
         Analyze a VSS signal definition and add mapping entry if correct mapping found.
         """
@@ -444,17 +639,17 @@ class Mapper(DBCParser):
             log.debug("VSS signal %s has \"dbc2vss\" property", expanded_name)
             dbc2vss_def = node["dbc2vss"]
         if dbc2vss_def is not None:
-            self._analyze_dbc2vss(expanded_name, node, dbc2vss_def)
+            self._analyze_dbc2vss(tables, expanded_name, node, dbc2vss_def)
         if "vss2dbc" in node:
             if node["type"] == "actuator":
                 log.debug("VSS signal %s has \"vss2dbc\" property", expanded_name)
-                self._analyze_vss2dbc(expanded_name, node, node["vss2dbc"])
+                self._analyze_vss2dbc(tables, expanded_name, node, node["vss2dbc"])
             else:
                 # vss2dbc is handled by subscription to target value, so only makes sense for actuators
                 log.error("vss2dbc only allowed for actuators, VSS signal %s is not an actuator!", expanded_name)
                 sys.exit(-1)
 
-    def _traverse_vss_node(self, name, node, prefix=""):
+    def _traverse_vss_node(self, tables: _MappingTables, name, node, prefix=""):
         """
         Traverse a VSS node/tree and order all found VSS signals to be analyzed
         so that mapping can be extracted.
@@ -473,13 +668,13 @@ class Mapper(DBCParser):
         # Assuming it to be a dict
         if is_branch:
             for item in node["children"].items():
-                self._traverse_vss_node(item[0], item[1], prefix)
+                self._traverse_vss_node(tables, item[0], item[1], prefix)
         elif is_signal:
             expanded_name = prefix + name
-            self._analyze_signal(expanded_name, node)
+            self._analyze_signal(tables, expanded_name, node)
         elif isinstance(node, dict):
             for item in node.items():
-                self._traverse_vss_node(item[0], item[1], prefix)
+                self._traverse_vss_node(tables, item[0], item[1], prefix)
 
     def get_dbc2vss_mapping(self, dbc_name: str, vss_name: str) -> Optional[VSSMapping]:
         """
@@ -491,6 +686,13 @@ class Mapper(DBCParser):
                     return mapping
         return None
 
+    def get_dbc2vss_mappings_by_index(self) -> Sequence[VSSMapping]:
+        """
+        Get all dbc2vss mappings, indexed by VSSMapping.mapping_idx.
+        Allows resolving the mapping of a VSSObservation without any lookup by name.
+        """
+        return self._mappings_by_index
+
     def get_dbc2vss_entries(self) -> KeysView[str]:
         """Get all CAN signal names for which a mapping to a VSS Data Entry exists."""
         return self._dbc2vss_mapping.keys()
@@ -516,27 +718,28 @@ class Mapper(DBCParser):
         log.info("Has VSS --> DBC mapping")
         return bool(self._vss2dbc_mapping)
 
-    def get_dbc2vss_mappings(self, dbc_name: str) -> List[VSSMapping]:
+    def get_dbc2vss_mappings(self, dbc_name: str) -> Sequence[VSSMapping]:
         if dbc_name in self._dbc2vss_mapping:
             return self._dbc2vss_mapping[dbc_name]
-        return []
+        return ()
 
-    def handle_update(self, vss_name: str, value: Any) -> Set[str]:
+    def handle_update(self, vss_name: str, value: Any) -> List[Tuple[int, str, Any]]:
         """
         Update the last known CAN signal value of mappings defined for a given VSS Data Entry.
-        Return a set of affected CAN signal identifiers.
+        Return a list of (frame ID, CAN signal name, CAN signal value) of the affected CAN signals.
         Types of values tested so far: int, bool
         """
-        dbc_ids = set()
+        affected_signals: List[Tuple[int, str, Any]] = []
         # Theoretically there might me multiple DBC-signals served by this VSS-signal
         log.info("[handle_update] Handling update for VSS signals: %s", vss_name)
         for dbc_mapping in self._vss2dbc_mapping[vss_name]:
 
             dbc_value = dbc_mapping.transform_value(value)
             dbc_mapping.last_dbc_value = dbc_value
-            dbc_ids.add(dbc_mapping.dbc_name)
-        log.info("[handle_update] VSS %s mapped to DBC signals: %s", vss_name, dbc_ids)
-        return dbc_ids
+            for msg_def in self.get_messages_for_signal(dbc_mapping.dbc_name):
+                affected_signals.append((msg_def.frame_id, dbc_mapping.dbc_name, dbc_value))
+        log.info("[handle_update] VSS %s mapped to DBC signals: %s", vss_name, affected_signals)
+        return affected_signals
 
     def get_default_values(self, can_id) -> Dict[str, Any]:
 
@@ -551,7 +754,10 @@ class Mapper(DBCParser):
     def get_value_dict(self, can_id):
 
         log.debug("Using stored information to create CAN message with frame ID %#x", can_id)
-        res = self.get_default_values(can_id)
+        if can_id in self._default_values:
+            res = self._default_values[can_id].copy()
+        else:
+            res = self.get_default_values(can_id)
         for can_mapping in self._vss2dbc_can_id_mapping[can_id]:
             log.debug("Using CAN signal %s with value %s", can_mapping.dbc_name, can_mapping.last_dbc_value)
             if can_mapping.last_dbc_value is not None:
@@ -18,10 +18,15 @@
 # SPDX-License-Identifier: Apache-2.0
 ########################################################################
 
+import contextlib
+import functools
+import hashlib
 import logging
+import pickle
 import sys
 import os
 
+import cantools  # type: ignore
 import cantools.database  # type: ignore
 
 from types import MappingProxyType
@@ -29,6 +34,19 @@ from typing import cast, Dict, List, Set, Tuple
 
 log = logging.getLogger(__name__)
 
+# Version of the on-disk cache of parsed CAN databases.
+# Bump this whenever cached databases become incompatible (the cantools version is part of the key anyway).
+CACHE_VERSION = 1
+
+
+def _cache_dir() -> str:
+    """Get the directory for caching parsed CAN databases, can be overridden by DBC_CACHE_DIR."""
+    cache_dir = os.environ.get("DBC_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(cache_home, "dbcfeeder")
+
 
 class DBCParser:
 
@@ -49,35 +67,93 @@ class DBCParser:
             # (29-bit) frame IDs when looking up message definitions
             self._frame_id_mask = 0b00011111111111111111100000000
 
-        first = True
-        processed_files: Set[str] = set()
+        filenames: List[str] = []
         for filename in [name.strip() for name in dbc_file_names]:
-            if filename in processed_files:
+            if filename in filenames:
                 log.warning("DBC file %s has already been read, ignoring it!", filename)
                 continue
-            processed_files.add(filename)
-            if first:
+            filenames.append(filename)
+
+        cache_key = self._cache_key(filenames, use_strict_parsing)
+        self._db = DBCParser._load_cached_database(cache_key, tuple(filenames), use_strict_parsing,
+                                                   self._frame_id_mask)
+
+        # Init some dictionaries to speed up search
+        self._signal_to_message_definitions = self._populate_signal_to_message_map()
+
+    def _cache_key(self, filenames: List[str], use_strict_parsing: bool) -> str:
+        """
+        Compute the key for caching the database parsed from the given files.
+        The key covers the content of the files as well as all parameters influencing parsing.
+        """
+        digest = hashlib.sha1()
+        digest.update(f"{CACHE_VERSION}:{cantools.__version__}:{use_strict_parsing}:{self._frame_id_mask}".encode())
+        for filename in filenames:
+            digest.update(os.path.splitext(filename)[1].lower().encode())
+            with open(filename, "rb") as file:
+                digest.update(hashlib.sha1(file.read()).digest())
+        return digest.hexdigest()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _load_cached_database(cache_key: str, filenames: Tuple[str, ...], use_strict_parsing: bool,
+                              frame_id_mask: int) -> cantools.database.can.database.Database:
+        """
+        Load the database from the on-disk cache, or parse the files and update the cache.
+        Parsed databases are also kept in memory (keyed by content) for the lifetime of the process.
+        """
+        cache_file = os.path.join(_cache_dir(), cache_key + ".pkl")
+        try:
+            with open(cache_file, "rb") as file:
+                database = pickle.load(file)
+            log.info("Using cached CAN message definitions from %s", cache_file)
+            return database
+        except FileNotFoundError:
+            pass
+        except Exception:
+            log.warning("Ignoring unreadable cache file %s", cache_file, exc_info=True)
+
+        database = DBCParser._parse_files(filenames, use_strict_parsing, frame_id_mask)
+
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(tmp_file, "wb") as file:
+                pickle.dump(database, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+            log.info("Cached CAN message definitions in %s", cache_file)
+        except Exception:
+            log.warning("Failed to cache CAN message definitions in %s", cache_file, exc_info=True)
+            with contextlib.suppress(OSError):
+                os.remove(tmp_file)
+        return database
+
+    @staticmethod
+    def _parse_files(filenames: Tuple[str, ...], use_strict_parsing: bool,
+                     frame_id_mask: int) -> cantools.database.can.database.Database:
+        database = None
+        for filename in filenames:
+            if database is None:
                 log.info("Reading definitions from bus description file %s", filename)
-                database = cantools.database.load_file(
+                loaded = cantools.database.load_file(
                     filename,
                     strict=use_strict_parsing,
-                    frame_id_mask=self._frame_id_mask
+                    frame_id_mask=frame_id_mask
                 )
                 # load_file can return multiple types of databases, make sure we have CAN database
-                if isinstance(database, cantools.database.can.database.Database):
-                    self._db = cast(cantools.database.can.database.Database, database)
-                    first = False
+                if isinstance(loaded, cantools.database.can.database.Database):
+                    database = cast(cantools.database.can.database.Database, loaded)
                 else:
                     log.error("File %s is not a CAN database, likely a diagnostics database", filename)
                     sys.exit(-1)
             else:
                 log.info("Adding definitions from DBC file %s", filename)
-                self._add_db_file(filename)
-
-        # Init some dictionaries to speed up search
-        self._signal_to_message_definitions = self._populate_signal_to_message_map()
+                DBCParser._add_db_file(database, filename)
+        if database is None:
+            raise ValueError("No CAN message definition files given")
+        return database
 
-    def _populate_signal_to_message_map(self) -> Dict[str, Set[cantools.database.Message]]:
+    def _populate_signal_to_message_map(self) -> Dict[str, Tuple[cantools.database.Message, ...]]:
 
         signal_to_message_defs: Dict[str, Set[cantools.database.Message]] = {}
 
@@ -101,9 +177,11 @@ class DBCParser:
                 to prevent unexpected behaviour when mapping VSS Data Entries to these signals."""
             )
 
-        return signal_to_message_defs
+        # the map is read-only from now on
+        return {sig_name: tuple(messages) for sig_name, messages in signal_to_message_defs.items()}
 
-    def _determine_db_format_and_encoding(self, filename) -> Tuple[str, str]:
+    @staticmethod
+    def _determine_db_format_and_encoding(filename) -> Tuple[str, str]:
         db_format = os.path.splitext(filename)[1][1:].lower()
 
         try:
@@ -113,16 +191,17 @@ class DBCParser:
 
         return db_format, encoding
 
-    def _add_db_file(self, filename: str):
-        db_format, encoding = self._determine_db_format_and_encoding(filename)
+    @staticmethod
+    def _add_db_file(database: cantools.database.can.database.Database, filename: str):
+        db_format, encoding = DBCParser._determine_db_format_and_encoding(filename)
         if db_format == "arxml":
-            self._db.add_arxml_file(filename, encoding)
+            database.add_arxml_file(filename, encoding)
         elif db_format == "dbc":
-            self._db.add_dbc_file(filename, encoding)
+            database.add_dbc_file(filename, encoding)
         elif db_format == "kcd":
-            self._db.add_kcd_file(filename, encoding)
+            database.add_kcd_file(filename, encoding)
         elif db_format == "sym":
-            self._db.add_sym_file(filename, encoding)
+            database.add_sym_file(filename, encoding)
         else:
             log.warning("Cannot read CAN message definitions from file using unsupported format: %s", db_format)
 
@@ -130,16 +209,15 @@ class DBCParser:
         """Get the frame ID bit mask used for filtering messages received from CAN bus."""
         return self._frame_id_mask
 
-    def get_messages_for_signal(self, sig_to_find: str) -> Set[cantools.database.Message]:
+    def get_messages_for_signal(self, sig_to_find: str) -> Tuple[cantools.database.Message, ...]:
         """Get all CAN message definitions that use a given CAN signal name."""
         if sig_to_find in self._signal_to_message_definitions:
             return self._signal_to_message_definitions[sig_to_find]
 
         log.warning("Signal %s not found in CAN message database", sig_to_find)
-        empty_set: Set[cantools.database.Message] = set()
-        self._signal_to_message_definitions[sig_to_find] = empty_set
-        log.info("Returning empty set for signal %s", sig_to_find)
-        return empty_set
+        self._signal_to_message_definitions[sig_to_find] = ()
+        log.info("Returning empty tuple for signal %s", sig_to_find)
+        return ()
 
     def get_message_by_frame_id(self, frame_id: int) -> cantools.database.Message:
         """
@@ -21,18 +21,18 @@
 import threading
 import logging
 
-from queue import Queue
 from typing import Optional
 
 from dbcfeederlib.canclient import CANClient
 from dbcfeederlib import canreader
 from dbcfeederlib import dbc2vssmapper
+from dbcfeederlib.spscring import SPSCRing
 
 log = logging.getLogger(__name__)
 
 
 class DBCReader(canreader.CanReader):
-    def __init__(self, rxqueue: Queue, mapper: dbc2vssmapper.Mapper, can_port: str,
+    def __init__(self, rxqueue: SPSCRing, mapper: dbc2vssmapper.Mapper, can_port: str,
                  can_fd: bool, dump_file: Optional[str] = None):
         super().__init__(rxqueue, mapper, can_port, dump_file, can_fd=can_fd)
 
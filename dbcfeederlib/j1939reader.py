@@ -25,20 +25,20 @@
 
 import logging
 
-from queue import Queue
 from typing import Optional
 
 import j1939  # type: ignore[import]
 
 from dbcfeederlib import canreader
 from dbcfeederlib import dbc2vssmapper
+from dbcfeederlib.spscring import SPSCRing
 
 log = logging.getLogger(__name__)
 
 
 class J1939Reader(canreader.CanReader):
 
-    def __init__(self, rxqueue: Queue, mapper: dbc2vssmapper.Mapper, can_port: str, dump_file: Optional[str] = None):
+    def __init__(self, rxqueue: SPSCRing, mapper: dbc2vssmapper.Mapper, can_port: str, dump_file: Optional[str] = None):
         super().__init__(rxqueue, mapper, can_port, dump_file)
 
         self._ecu = j1939.ElectronicControlUnit()
@@ -14,6 +14,7 @@
 #################################################################################
 
 import logging
+import time
 from typing import Any, List
 import json
 
@@ -74,6 +75,20 @@ class ServerClientWrapper(clientwrapper.ClientWrapper):
             return False
         return self._kuksa.checkConnection()
 
+    def wait_connected(self, timeout: float) -> bool:
+        # kuksa-client does not notify about connection changes of the websocket client,
+        # so poll and keep the connection event up to date with the result
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.is_connected():
+                self._connected_event.set()
+                return True
+            self._connected_event.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(0.2, remaining))
+
     def is_signal_defined(self, vss_name: str) -> bool:
         if self._kuksa is None:
             log.error("is_signal_defined called before client has been started")
@@ -104,10 +119,10 @@ class ServerClientWrapper(clientwrapper.ClientWrapper):
         else:
             send_value = str(value)
         tmp_text = self._kuksa.setValue(name, send_value)
-        log.debug(f"Got setValue response for {name}:{send_value}:{tmp_text}")
+        log.debug("Got setValue response for %s:%s:%s", name, send_value, tmp_text)
         resp = json.loads(tmp_text)
         if "error" in resp:
-            log.error(f"Error sending {name} to kuksa-val-server: {resp['error']}")
+            log.error("Error sending %s to kuksa-val-server: %s", name, resp['error'])
             success = False
 
         return success
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+#################################################################################
+# Copyright (c) 2023 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License 2.0 which is available at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+#################################################################################
+
+import logging
+import threading
+
+from typing import Any, List
+
+log = logging.getLogger(__name__)
+
+
+class SPSCRing:
+    """
+    Bounded single-producer/single-consumer ring buffer.
+
+    Replaces queue.Queue between the CAN reader thread (producer) and the receiver thread (consumer).
+    The head index is only written by the consumer and the tail index is only written by the producer,
+    so no lock is needed as long as there is exactly one thread on either side.
+    The consumer fetches items in batches and blocks on an event only if the ring is empty.
+    """
+
+    def __init__(self, capacity: int = 16384):
+        self._capacity = capacity
+        self._buf: List[Any] = [None] * capacity
+        # index of the next item to read, only modified by the consumer
+        self._head = 0
+        # index of the next free slot, only modified by the producer
+        self._tail = 0
+        self._not_empty = threading.Event()
+
+    def qsize(self) -> int:
+        """Get the (approximate) number of items in the ring."""
+        return self._tail - self._head
+
+    def put_nowait(self, item: Any) -> bool:
+        """
+        Add an item to the ring.
+        Returns False if the ring is full and the item has been dropped.
+        """
+        tail = self._tail
+        if tail - self._head >= self._capacity:
+            return False
+        self._buf[tail % self._capacity] = item
+        self._tail = tail + 1
+        # Only wake up the consumer if it has (or is about to) put itself to sleep.
+        # The tail must be published before this check, see wait().
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+        return True
+
+    def get_batch(self, max_items: int) -> List[Any]:
+        """
+        Remove and return up to max_items items from the ring, oldest first.
+        Returns an empty list if the ring is empty.
+        """
+        head = self._head
+        available = self._tail - head
+        if available <= 0:
+            return []
+        count = min(max_items, available)
+        batch: List[Any] = []
+        for i in range(head, head + count):
+            index = i % self._capacity
+            batch.append(self._buf[index])
+            self._buf[index] = None
+        self._head = head + count
+        return batch
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block the consumer until an item is available or the timeout expires.
+        Returns True if the ring is not empty.
+        """
+        self._not_empty.clear()
+        # Re-check after clearing, the producer may have added an item (and seen the event set)
+        # in between our last get_batch() and clear()
+        if self._tail != self._head:
+            return True
+        return self._not_empty.wait(timeout)
@@ -16,7 +16,6 @@ import argparse
 import configparser
 import logging
 import os
-import queue
 import sys
 import threading
 import time
@@ -25,6 +24,7 @@ from typing import Any, Dict, List, Optional
 
 from dbcfeederlib.canclient import CANClient
 from dbcfeederlib.canreader import CanReader
+from dbcfeederlib.spscring import SPSCRing
 from dbcfeederlib import dbc2vssmapper
 from dbcfeederlib import dbcreader
 from dbcfeederlib import j1939reader
@@ -50,7 +50,7 @@ class Feeder:
         self._running: bool = False
         self._reader: Optional[CanReader] = None
         self._mapper: Optional[dbc2vssmapper.Mapper] = None
-        self._dbc2vss_queue: queue.Queue[dbc2vssmapper.VSSObservation] = queue.Queue()
+        self._dbc2vss_queue = SPSCRing()
         self._output_file = output_file
         self._elmcan_config: Dict[str, Any] = {}
         self._dbc2vss_enabled = dbc2vss
@@ -136,6 +136,8 @@ class Feeder:
         return self._running
 
     def _run_receiver(self):
+        # Resolve mappings of queued observations by index rather than by name
+        mappings_by_index = self._mapper.get_dbc2vss_mappings_by_index()
         processing_started = False
         messages_processed = 0
         last_sent_log_entry = 0
@@ -150,32 +152,36 @@ class Feeder:
                     if not processing_started:
                         processing_started = True
                         log.info("Starting to process CAN signals")
-                    queue_size = self._dbc2vss_queue.qsize()
-                    if queue_size > queue_max_size:
-                        queue_max_size = queue_size
-                    vss_observation = self._dbc2vss_queue.get(timeout=1)
-                    vss_mapping = self._mapper.get_dbc2vss_mapping(vss_observation.dbc_name, vss_observation.vss_name)
-                    value = vss_mapping.transform_value(vss_observation.raw_value)
-                    if value is None:
-                        log.warning(
-                            "Value ignored for dbc %s to VSS %s, from raw value %s of type %s",
-                            vss_observation.dbc_name, vss_observation.vss_name, vss_observation.raw_value, type(vss_observation.raw_value)
-                        )
-                    elif not vss_mapping.change_condition_fulfilled(value):
-                        log.debug("Value condition not fulfilled for VSS %s, value %s", vss_observation.vss_name, value)
-                    else:
-                        output.write(f"Datapoint({vss_observation.vss_name}, {value}, {vss_observation.time})\n")
-                        output.flush()
-                        log.debug("Processed DataPoint(%s, %s, %f)", vss_observation.vss_name, value, vss_observation.time)
-                        messages_processed += 1
-                        if messages_processed >= (2 * last_sent_log_entry):
-                            log.info(
-                                "Processed %d CAN messages, maximum queue size: %d",
-                                messages_processed, queue_max_size
+                    batch = self._dbc2vss_queue.get_batch(64)
+                    if not batch:
+                        self._dbc2vss_queue.wait(1.0)
+                        continue
+                    for vss_observation in batch:
+                        vss_mapping = mappings_by_index[vss_observation.mapping_idx]
+                        value = vss_mapping.transform_value(vss_observation.raw_value)
+                        if value is None:
+                            log.warning(
+                                "Value ignored for dbc %s to VSS %s, from raw value %s of type %s",
+                                vss_observation.dbc_name, vss_observation.vss_name,
+                                vss_observation.raw_value, type(vss_observation.raw_value)
                             )
-                            last_sent_log_entry = messages_processed
-                except queue.Empty:
-                    pass
+                        elif not vss_mapping.change_condition_fulfilled(value):
+                            log.debug("Value condition not fulfilled for VSS %s, value %s",
+                                      vss_observation.vss_name, value)
+                        else:
+                            output.write(f"Datapoint({vss_observation.vss_name}, {value}, {vss_observation.time})\n")
+                            output.flush()
+                            log.debug("Processed DataPoint(%s, %s, %f)",
+                                      vss_observation.vss_name, value, vss_observation.time)
+                            messages_processed += 1
+                            if messages_processed >= (2 * last_sent_log_entry):
+                                queue_max_size = max(queue_max_size, self._dbc2vss_queue.qsize())
+                                log.info(
+                                    "Processed %d CAN messages, maximum queue size: %d",
+                                    messages_processed, queue_max_size
+                                )
+                                last_sent_log_entry = messages_processed
+                    dbc2vssmapper.VSSObservation.release_all(batch)
                 except Exception as e:
                     log.error("Exception caught in main loop: %s", e, exc_info=True)
         finally: